@@ -0,0 +1,151 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+import hull
+import predicates
+
+# Hulls of many small independent point sets in one call.
+# The sets are passed as a ragged array: flat (N, 2) coordinates plus
+# offsets, set i being coords[offsets[i]:offsets[i + 1]]. All sets are sorted
+# together with one lexsort and the upper and lower chains of every set are
+# peeled at once: each round drops, across the whole batch, every point that
+# is not a clockwise turn between its current neighbours. Such a point can
+# never be a hull vertex, so the rounds stop at exactly the hull chains.
+
+max_rounds = 64
+block_points = 1 << 14
+
+def batch_hull(coords, offsets, workers:int=None, cache=None):
+    # Returns (indices, hull_offsets), hull i being
+    # indices[hull_offsets[i]:hull_offsets[i + 1]], with indices relative to
+    # the start of set i and in the same clockwise order as hull.py.
+    # With a hull_cache.HullCache only the sets missing from it are computed.
+    coords = np.asarray(coords)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if offsets.ndim != 1 or len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(coords) or np.any(np.diff(offsets) < 0):
+        raise ValueError("Offsets must start at 0, end at len(coords) and never decrease")
+    if cache is not None:
+        return _cached_batch_hull(coords, offsets, workers, cache)
+    if workers is not None and workers > 1 and len(offsets) > 2:
+        return _pooled_batch_hull(coords, offsets, workers)
+
+    # Work through the batch in blocks of whole sets, which keeps the
+    # temporaries small enough to stay in cache
+    groups = _split_sets(offsets, -(-int(offsets[-1]) // block_points))
+    return _concat_results([
+        _block_hull(coords[offsets[lo]:offsets[hi]], offsets[lo:hi + 1] - offsets[lo])
+        for lo, hi in zip(groups[:-1], groups[1:])
+    ], len(offsets) - 1)
+
+def _block_hull(coords, offsets):
+    xs, ys = hull.as_xy(coords)
+    counts = np.diff(offsets)
+    seg = np.repeat(np.arange(len(counts)), counts)
+
+    order = np.lexsort((-ys, xs, seg))
+    # Drop repeated points, they would cancel each other out while peeling
+    same = (seg[order[1:]] == seg[order[:-1]]) & (xs[order[1:]] == xs[order[:-1]]) & (ys[order[1:]] == ys[order[:-1]])
+    keep = np.ones(len(order), dtype=bool)
+    keep[1:] = ~same
+    order = order[keep]
+
+    # Peel on the sorted copy so that neighbours are close in memory, the
+    # chains hold positions into it
+    sx, sy, sseg = xs[order], ys[order], seg[order]
+    positions = np.arange(len(order))
+    upper = order[_peel(sx, sy, sseg, positions)]
+    lower = order[_peel(sx, sy, sseg, _reverse_segments(positions, sseg))]
+
+    # Both chains share their endpoints: hull = upper[:-1] + lower[:-1],
+    # except for sets of a single point which keep it once
+    upper_first, upper_last = _set_edges(seg[upper])
+    _, lower_last = _set_edges(seg[lower])
+    single = upper_first & upper_last
+    merged = np.concatenate((upper[~upper_last | single], lower[~lower_last]))
+    merged = merged[np.argsort(seg[merged], kind="stable")]
+
+    hull_offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(seg[merged], minlength=len(counts)), out=hull_offsets[1:])
+    return merged - offsets[seg[merged]], hull_offsets
+
+def _set_edges(s):
+    # Flags for the first and last entry of every set in a grouped array
+    first = np.ones(len(s), dtype=bool)
+    last = np.ones(len(s), dtype=bool)
+    first[1:] = s[1:] != s[:-1]
+    last[:-1] = first[1:]
+    return first, last
+
+def _reverse_segments(order, seg) -> np.ndarray:
+    # Reverse the order within each set, keeping the sets in place
+    return order[np.lexsort((-np.arange(len(order)), seg[order]))]
+
+def _peel(xs, ys, seg, chain) -> np.ndarray:
+    turn = predicates.cross_for(xs, ys)
+    for _ in range(max_rounds):
+        s = seg[chain]
+        interior = np.zeros(len(chain), dtype=bool)
+        interior[1:-1] = (s[:-2] == s[1:-1]) & (s[1:-1] == s[2:])
+        a, b, c = chain[:-2], chain[1:-1], chain[2:]
+        turns = turn(xs[a], ys[a], xs[b], ys[b], xs[c], ys[c])
+        remove = np.zeros(len(chain), dtype=bool)
+        remove[1:-1] = interior[1:-1] & (turns >= 0)
+        if not remove.any():
+            return chain
+        chain = chain[~remove]
+
+    # Rarely the peeling only makes slow progress, finish those sets with
+    # the usual stack based chain instead
+    x, y = xs.tolist(), ys.tolist()
+    starts = np.flatnonzero(_set_edges(seg[chain])[0])
+    ends = np.concatenate((starts[1:], [len(chain)]))
+    return np.array(
+        [i for lo, hi in zip(starts, ends) for i in hull._chain(x, y, chain[lo:hi].tolist())],
+        dtype=np.int64,
+    )
+
+def _split_sets(offsets, parts:int) -> np.ndarray:
+    # Boundaries splitting the sets into contiguous groups of roughly equal
+    # point counts
+    groups = np.searchsorted(offsets, np.linspace(0, offsets[-1], max(parts, 1) + 1), side="left")
+    return np.unique(np.concatenate(([0], groups, [len(offsets) - 1])))
+
+def _concat_results(results, count:int):
+    if len(results) == 0:
+        return np.empty(0, dtype=np.int64), np.zeros(count + 1, dtype=np.int64)
+    indices = np.concatenate([r[0] for r in results])
+    hull_offsets = [np.zeros(1, dtype=np.int64)]
+    for _, part in results:
+        hull_offsets.append(part[1:] + hull_offsets[-1][-1])
+    return indices, np.concatenate(hull_offsets)
+
+def _pooled_batch_hull(coords, offsets, workers:int):
+    groups = _split_sets(offsets, workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(batch_hull, coords[offsets[lo]:offsets[hi]], offsets[lo:hi + 1] - offsets[lo])
+            for lo, hi in zip(groups[:-1], groups[1:])
+        ]
+        return _concat_results([f.result() for f in futures], len(offsets) - 1)
+
+def _cached_batch_hull(coords, offsets, workers:int, cache):
+    count = len(offsets) - 1
+    sets = [coords[offsets[i]:offsets[i + 1]] for i in range(count)]
+    keys = [cache.key(points, "batch") for points in sets]
+    hulls = [cache.get_hull(key) for key in keys]
+    missing = [i for i, h in enumerate(hulls) if h is None]
+    if len(missing) > 0:
+        # Solve all the misses in one batch, then evict once
+        missing_offsets = np.zeros(len(missing) + 1, dtype=np.int64)
+        np.cumsum([len(sets[i]) for i in missing], out=missing_offsets[1:])
+        indices, hull_offsets = batch_hull(np.concatenate([sets[i] for i in missing]), missing_offsets, workers)
+        for j, i in enumerate(missing):
+            hulls[i] = indices[hull_offsets[j]:hull_offsets[j + 1]]
+            cache.put_hull(keys[i], hulls[i], evict=False)
+        cache.evict()
+
+    hull_offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum([len(h) for h in hulls], out=hull_offsets[1:])
+    if count == 0:
+        return np.empty(0, dtype=np.int64), hull_offsets
+    return np.concatenate(hulls).astype(np.int64, copy=False), hull_offsets
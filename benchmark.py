@@ -0,0 +1,271 @@
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import numpy as np
+
+import geometry
+import hull
+import predicates
+import point_io
+import hull3d
+import point_gen
+
+# Headless benchmarks for the geometry primitives and the hull engines.
+# Nothing is rendered, and manim is only imported for the cases that build
+# the scenes. Those are skipped, and recorded as skipped, when manim is not
+# installed.
+# Results are written as JSON so runs can be compared with --compare.
+#
+# Usage:
+#   python benchmark.py --max-size 100000 --output bench.json
+#   python benchmark.py --max-size 100000 --compare bench.json
+
+default_seed = 3
+default_sizes = [10 ** k for k in range(1, 8)]
+scale = 10 ** 6
+
+def uniform_square(rng, n:int) -> np.ndarray:
+    return rng.integers(0, scale, (n, 2))
+
+def uniform_disk(rng, n:int) -> np.ndarray:
+    r = scale * np.sqrt(rng.random(n))
+    theta = rng.random(n) * 2 * np.pi
+    return np.column_stack((r * np.cos(theta), r * np.sin(theta)))
+
+def circle(rng, n:int) -> np.ndarray:
+    # Every point is on the hull
+    theta = np.sort(rng.random(n)) * 2 * np.pi
+    return np.column_stack((scale * np.cos(theta), scale * np.sin(theta)))
+
+def gaussian_clusters(rng, n:int, clusters:int=8) -> np.ndarray:
+    centres = rng.integers(0, scale, (clusters, 2))
+    return centres[rng.integers(0, clusters, n)] + rng.normal(0, scale / 50, (n, 2))
+
+def collinear(rng, n:int) -> np.ndarray:
+    # Points on the sides and the diagonal of a square, so every hull edge
+    # and many candidate rays hold collinear points
+    t = rng.integers(0, scale, n)
+    side = rng.integers(0, 5, n)
+    xs = np.select([side == 0, side == 1, side == 2, side == 3], [t, scale, t, 0], t)
+    ys = np.select([side == 0, side == 1, side == 2, side == 3], [0, t, scale, t], t)
+    return np.column_stack((xs, ys))
+
+DISTRIBUTIONS = {
+    "uniform_square": uniform_square,
+    "uniform_disk": uniform_disk,
+    "circle": circle,
+    "gaussian_clusters": gaussian_clusters,
+    "collinear": collinear,
+}
+
+def _timed(fn, repeat:int):
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return times, result
+
+def _engine_case(engine:str, cull:bool=False):
+    def case(points, context):
+        return lambda: hull.convex_hull(points, engine, cull)
+    return case
+
+def _orientations_case(points, context):
+    xs, ys = points[:, 0], points[:, 1]
+    return lambda: predicates.orientations(xs[0], ys[0], xs[-1], ys[-1], xs, ys)
+
+def _angular_order_case(points, context):
+    # Around the centre of the points, like GrahamScan's sort around a
+    # median point
+    xs, ys = points[:, 0], points[:, 1]
+    ox, oy = np.median(xs), np.median(ys)
+    return lambda: hull.angular_order(xs, ys, ox, oy, 1, 0)
+
+def _hull3d_case(points, context):
+    # The 2D distribution with uniform heights on top
+    zs = np.random.default_rng(len(points)).integers(0, scale, len(points)).astype(points.dtype)
+    points = np.column_stack((points, zs))
+    return lambda: hull3d.convex_hull_3d(points)
+
+def _load_points_case(binary:bool):
+    def case(points, context):
+        filename = os.path.join(context["tmp"], "points.bin" if binary else "points.txt")
+        if binary:
+            point_io.write_binary_points(filename, points[:, 0], points[:, 1])
+        else:
+            np.savetxt(filename, points, fmt="%d" if points.dtype.kind in "iu" else "%.0f")
+        return lambda: point_io.load_points(filename)
+    return case
+
+def _mpoints(points):
+    return [geometry.mPoint(x, y) for x, y in points.tolist()]
+
+def _angle_to_case(points, context):
+    mpoints = _mpoints(points)
+    wrt = geometry.mLine(mpoints[0], mpoints[1])
+    lines = [geometry.mLine(mpoints[0], p) for p in mpoints[1:]]
+    return lambda: [wrt.get_angle_to(l) for l in lines]
+
+def _left_turn_case(points, context):
+    mpoints = _mpoints(points)
+    lines = [geometry.mLine(a, b) for a, b in zip(mpoints[:-1], mpoints[1:])]
+    return lambda: [a.is_left_turn_to(b) for a, b in zip(lines[:-1], lines[1:])]
+
+def _scene_lines_case(module:str):
+    def case(points, context):
+        scene_module = importlib.import_module(module)
+        scene = _headless_scene(scene_module)
+        mpoints = _mpoints(points)
+        origin = mpoints[hull.leftmost(points)]
+        if module == "jarvis_march":
+            return lambda: scene.construct_lines_from_point(origin, scene_module.op.ge, mpoints)
+        return lambda: scene.construct_lines_from_point(origin, mpoints)
+    return case
+
+def _randomize_points_case(points, context):
+    # Uses the scene's own generator, seed and grid, ignoring the distribution
+    import graham_scan as scene_module
+    scene = _headless_scene(scene_module)
+    n = min(len(points), 19 * 19)
+    return lambda: scene.randomize_points(0, 20, 0, 20, n)
+
+def _grid_points_case(points, context):
+    # point_gen's counterpart of the distribution on the benchmark's grid
+    distribution = {"uniform_disk": "disk", "circle": "circle", "gaussian_clusters": "gaussian"}.get(context["distribution"], "uniform")
+    return lambda: point_gen.grid_points(len(points), 0, scale, 0, scale, distribution, default_seed)
+
+def _headless_scene(module):
+    # The helpers do not touch scene state, so skip Scene.__init__ and its
+    # renderer entirely
+    cls = getattr(module, "GrahamScan", None) or getattr(module, "JarvisMarch")
+    return cls.__new__(cls)
+
+# name: (setup, largest size, needs manim, distributions it is skipped on)
+CASES = {
+    "orientations": (_orientations_case, 10 ** 7, False, ()),
+    "angular_order": (_angular_order_case, 10 ** 7, False, ()),
+    "load_points_text": (_load_points_case(False), 10 ** 6, False, ()),
+    "load_points_binary": (_load_points_case(True), 10 ** 7, False, ()),
+    "graham": (_engine_case("graham"), 10 ** 6, False, ()),
+    "jarvis": (_engine_case("jarvis"), 10 ** 6, False, ("circle",)),
+    "jarvis_circle": (_engine_case("jarvis"), 10 ** 4, False, tuple(d for d in DISTRIBUTIONS if d != "circle")),
+    "monotone": (_engine_case("monotone"), 10 ** 7, False, ()),
+    "monotone_culled": (_engine_case("monotone", cull=True), 10 ** 7, False, ()),
+    "chan": (_engine_case("chan"), 10 ** 6, False, ()),
+    "quickhull_3d": (_hull3d_case, 10 ** 6, False, ("collinear",)),
+    "get_angle_to": (_angle_to_case, 10 ** 5, False, ()),
+    "is_left_turn_to": (_left_turn_case, 10 ** 5, False, ()),
+    "graham_construct_lines_from_point": (_scene_lines_case("graham_scan"), 10 ** 4, True, ()),
+    "jarvis_construct_lines_from_point": (_scene_lines_case("jarvis_march"), 10 ** 4, True, ()),
+    "randomize_points": (_randomize_points_case, 10 ** 3, True, ()),
+    "grid_points": (_grid_points_case, 10 ** 7, False, ("circle", "collinear")),
+    "grid_points_circle": (_grid_points_case, 10 ** 6, False, tuple(d for d in DISTRIBUTIONS if d != "circle")),
+}
+
+def run(cases, distributions, sizes, seed:int, repeat:int, log=sys.stderr) -> dict:
+    with tempfile.TemporaryDirectory(prefix="hull-bench-") as tmp:
+        results = _run_cases({"tmp": tmp}, cases, distributions, sizes, seed, repeat, log)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "seed": seed,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+def _manim_error():
+    if importlib.util.find_spec("manim") is None:
+        return "No module named 'manim'"
+    return None
+
+def _run_cases(context, cases, distributions, sizes, seed:int, repeat:int, log) -> list:
+    # Checked once, and only when a selected case needs manim
+    manim_error = _manim_error() if any(CASES[name][2] for name in cases) else None
+
+    results = []
+    for distribution in distributions:
+        for n in sizes:
+            rng = np.random.default_rng(seed)
+            points = DISTRIBUTIONS[distribution](rng, n)
+            context["distribution"] = distribution
+            for name in cases:
+                setup, largest, needs_manim, skip_on = CASES[name]
+                if n > largest or distribution in skip_on:
+                    continue
+                entry = {"case": name, "distribution": distribution, "n": n}
+                if needs_manim and manim_error is not None:
+                    results.append({**entry, "skipped": manim_error})
+                    continue
+                runs = repeat if n <= 10 ** 5 else 1
+                times, result = _timed(setup(points, context), runs)
+                entry.update({
+                    "repeat": runs,
+                    "best": min(times),
+                    "median": statistics.median(times),
+                })
+                if name in ("graham", "jarvis", "jarvis_circle", "monotone", "monotone_culled", "chan"):
+                    entry["hull_size"] = len(result)
+                results.append(entry)
+                print(f"{name:<36} {distribution:<18} {n:>9} {entry['best']:.6f}s", file=log)
+    return results
+
+def compare(report:dict, baseline:dict, threshold:float) -> list:
+    # Cases at least `threshold` times slower than in the baseline
+    previous = {(r["case"], r["distribution"], r["n"]): r for r in baseline["results"] if "best" in r}
+    regressions = []
+    for r in report["results"]:
+        old = previous.get((r["case"], r["distribution"], r["n"]))
+        if old is None or "best" not in r or old["best"] == 0:
+            continue
+        ratio = r["best"] / old["best"]
+        if ratio >= threshold:
+            regressions.append({**r, "baseline": old["best"], "ratio": ratio})
+    return regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the hull engines and geometry primitives")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--distributions", nargs="+", choices=sorted(DISTRIBUTIONS), default=list(DISTRIBUTIONS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=default_sizes)
+    parser.add_argument("--max-size", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=default_seed)
+    parser.add_argument("--scene-settings", action="store_true", help="Use seed and num_rand_points from graham_scan.py (needs manim)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None, help="JSON file to write, stdout when omitted")
+    parser.add_argument("--compare", default=None, help="Baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    sizes = [n for n in args.sizes if args.max_size is None or n <= args.max_size]
+    seed = args.seed
+    if args.scene_settings:
+        import graham_scan as settings
+        sizes, seed = [settings.num_rand_points], settings.seed
+    report = run(args.cases, args.distributions, sizes, seed, args.repeat)
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['case']} {r['distribution']} n={r['n']}: {r['baseline']:.6f}s -> {r['best']:.6f}s ({r['ratio']:.2f}x)", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
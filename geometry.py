@@ -1,18 +1,45 @@
-from manim import *
+from __future__ import annotations
+from typing import TYPE_CHECKING, List
+import numpy as np
+
+import predicates
+
+if TYPE_CHECKING:
+    from manim import Axes, Dot, Dot3D, Line, Polygon, ThreeDAxes
+
+# Points, lines and polygons for the scenes. Everything geometric works on
+# the plain coordinates with NumPy and predicates.py; manim is imported only
+# when a Dot, Line or Polygon is first built, so importing this module (or
+# running the geometric tests headlessly) never loads manim.
 
 class mPoint:
     x: int
     y: int
     npp: np.array
-    point: Dot
+    axes: Axes
+    _point: Dot
 
     def __init__(self, x:int, y:int, axes:Axes=None) -> None:
         self.x = x
         self.y = y
         self.npp = np.array([x, y, 0])
-        self.point = self.construct_point(x, y, axes)
+        self.axes = axes
+        self._point = None
+
+    # The Dot is only built the first time it is needed, so points used purely
+    # for geometric tests never allocate a mobject.
+    @property
+    def point(self) -> Dot:
+        if self._point is None:
+            self._point = self.construct_point(self.x, self.y, self.axes)
+        return self._point
+
+    @point.setter
+    def point(self, point:Dot) -> None:
+        self._point = point
     
     def construct_point(self, x:int, y:int, axes:Axes=None) -> Dot:
+        from manim import RED, Dot
         if axes is not None:
             dot = Dot(color=RED)
             dot.move_to(axes.c2p(x, y))
@@ -28,6 +55,14 @@ class mPoint:
 
     def get_point(self) -> "mPoint":
         return self.point
+
+    def get_center(self) -> np.array:
+        # Where the Dot is (or would be) drawn, without building it
+        if self._point is not None:
+            return self._point.get_center()
+        if self.axes is not None:
+            return self.axes.c2p(self.x, self.y)
+        return self.npp
     
     def set_color(self, color) -> "mPoint":
         self.point.set_color(color)
@@ -36,10 +71,38 @@ class mPoint:
     def move_to(self, coords) -> None:
         self.point.move_to(coords)
 
+class mPoint3D(mPoint):
+    z: int
+
+    def __init__(self, x:int, y:int, z:int, axes:ThreeDAxes=None) -> None:
+        super().__init__(x, y, axes)
+        self.z = z
+        self.npp = np.array([x, y, z])
+
+    def construct_point(self, x:int, y:int, axes:ThreeDAxes=None) -> Dot3D:
+        from manim import RED, Dot3D
+        if axes is not None:
+            dot = Dot3D(color=RED)
+            dot.move_to(axes.c2p(x, y, self.z))
+        else:
+            dot = Dot3D(point=np.array([x, y, self.z]), color=RED)
+        return dot
+
+    def get_coords(self):
+        return (self.x, self.y, self.z)
+
+    def get_center(self) -> np.array:
+        if self._point is not None:
+            return self._point.get_center()
+        if self.axes is not None:
+            return self.axes.c2p(self.x, self.y, self.z)
+        return self.npp
+
 class mLine:
     start: mPoint
     end: mPoint
-    line: "mLine"
+    _line: Line
+    _color: str
     slope: float
     angle: float
     mag: float
@@ -47,12 +110,27 @@ class mLine:
     def __init__(self, start:mPoint, end:mPoint) -> None:
         self.start = start
         self.end = end
-        self.line = self.construct_line(start, end)
+        self._line = None
+        self._color = None
+
+    # Like mPoint.point, the Line is built lazily from the endpoints' Dots
+    @property
+    def line(self) -> Line:
+        if self._line is None:
+            self._line = self.construct_line(self.start, self.end)
+            if self._color is not None:
+                self._line.set_color(self._color)
+        return self._line
+
+    @line.setter
+    def line(self, line:Line) -> None:
+        self._line = line
 
     def construct_line(self, start:mPoint, end:mPoint) -> Line:
+        from manim import Line
         line = Line(
-                start.point.get_center(),
-                end.point.get_center()
+                start.get_center(),
+                end.get_center()
                 )
         return line
     
@@ -102,23 +180,46 @@ class mLine:
         return self.mag
     
     def set_color(self, color) -> "mLine":
-        self.line.set_color(color)
+        # Colouring an unbuilt line is remembered until it is built
+        if self._line is None:
+            self._color = color
+        else:
+            self._line.set_color(color)
         return self
     
+    def compare_slope(self, other="mLine") -> int:
+        # Sign of self.slope - other.slope, from the endpoints rather than
+        # the rounded slopes. Vertical lines keep their stored +-inf slope.
+        ax, ay = self.end.x - self.start.x, self.end.y - self.start.y
+        bx, by = other.end.x - other.start.x, other.end.y - other.start.y
+        if ax == 0 or bx == 0:
+            return (self.slope > other.slope) - (self.slope < other.slope)
+        # ay/ax - by/bx has the sign of (ay*bx - by*ax) * ax*bx
+        turn = predicates.orientation(0, 0, bx, by, ax, ay)
+        return turn if (ax > 0) == (bx > 0) else -turn
+
+    def compare_length(self, other="mLine") -> int:
+        # Sign of self.mag - other.mag, on squared lengths
+        ax, ay = self.end.x - self.start.x, self.end.y - self.start.y
+        bx, by = other.end.x - other.start.x, other.end.y - other.start.y
+        a, b = ax * ax + ay * ay, bx * bx + by * by
+        return (a > b) - (a < b)
+
     def is_left_turn_to(self, dest="mLine") -> bool:
         # line1 A -> B (self)
         # line2 B -> C
-        # Must reconstruct to B -> A & B -> C
-        rev_line = mLine(self.end, self.start)
-        angle = dest.get_angle_to(rev_line)
-        # print(f"LEFT TURN TEST ANGLE {angle} : {angle > 180}")
-        return angle > 180
+        # Exact cross product test on A, B, C rather than comparing angles
+        return predicates.is_left_turn(
+            self.start.x, self.start.y,
+            self.end.x, self.end.y,
+            dest.end.x, dest.end.y
+        )
 
 class mPolygon:
     points: List[np.array]
     mpoints: List[mPoint]
     lines: List[mLine]
-    polygon: Polygon
+    _polygon: Polygon
 
     def __init__(self, points:List[mPoint]) -> None:
         self.points = []
@@ -132,4 +233,42 @@ class mPolygon:
             self.lines.append(mLine(points[i - 1], points[i]))
         self.lines.append(mLine(points[-1], points[0]))
 
-        self.polygon = Polygon(*self.points)
+        self._polygon = None
+
+    @property
+    def polygon(self) -> Polygon:
+        if self._polygon is None:
+            from manim import Polygon
+            self._polygon = Polygon(*self.points)
+        return self._polygon
+
+class mFace:
+    # Triangle of a 3D hull, the Polygon is built lazily like mLine.line
+    mpoints: List[mPoint3D]
+    _polygon: Polygon
+    _color: str
+
+    def __init__(self, a:mPoint3D, b:mPoint3D, c:mPoint3D, color=None) -> None:
+        # color defaults to manim's BLUE
+        self.mpoints = [a, b, c]
+        self._polygon = None
+        self._color = color
+
+    @property
+    def polygon(self) -> Polygon:
+        if self._polygon is None:
+            from manim import BLUE, Polygon
+            self._polygon = Polygon(
+                    *[p.get_center() for p in self.mpoints],
+                    color=BLUE if self._color is None else self._color,
+                    stroke_width=1,
+                    fill_opacity=0.35
+                    )
+        return self._polygon
+
+    def set_color(self, color) -> "mFace":
+        if self._polygon is None:
+            self._color = color
+        else:
+            self._polygon.set_color(color)
+        return self
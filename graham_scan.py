@@ -1,56 +1,87 @@
-from manim import *
-import importlib
+import functools
 import math
 import random
+from typing import List
+import numpy as np
+from manim import BLUE, RED, YELLOW, Dot, FadeIn, FadeOut, LaggedStart, ReplacementTransform, Scene, Uncreate, Unwrite, Write, color_gradient
 
-geo = importlib.import_module("geometry")
-mPoint = geo.mPoint
-mLine = geo.mLine
+from geometry import mLine, mPoint
+import hull
+from pointset import PointSet
+from profiling import InstrumentedScene
+import rendering
+CompactScene = rendering.CompactScene
+LevelOfDetailScene = rendering.LevelOfDetailScene
+ReplayScene = rendering.ReplayScene
+import point_io
+import scene_settings
+import point_gen
 
 points_file = "" # Leave empty for randomized points
 
 rdn = False
 seed = 3
 num_rand_points = 10
+distribution = "uniform" # Grid cells for randomized points: "uniform", "disk", "circle" or "gaussian"
 
 wait = True
 animation_speed = 1
+cull = False # Drop points inside the Akl-Toussaint polygon before running the algorithm
+compact = False # Render each algorithm step as a single play call
+lod_threshold = 500 # Above this many points, draw non-hull points as one point cloud
+lod_rays = 64 # Rays drawn per fan-out above lod_threshold
+replay = "" # "graham", "jarvis" or "monotone" to replay a headless trace of that algorithm instead of the steps below
+trace_file = "" # With replay, read the trace from here if it exists, otherwise write it here
+cache = False # Keep computed hulls and traces in the on-disk cache of hull_cache.py
 
-class GrahamScan(Scene):
+profile = False # Print time and allocations per algorithm phase and per play call
+profile_trace = "" # Filename for a Chrome trace of the same, empty for none
+
+scene_settings.apply(globals()) # Overrides from render_batch.py, if any
+
+class GrahamScan(CompactScene, LevelOfDetailScene, ReplayScene, InstrumentedScene, Scene):
     def construct(self):
-        if points_file != "":
-            points, min_x, max_x, min_y, max_y = self.load_points(points_file)
-            axes_x_min, axes_x_max = min_x - 1, max_x + 1
-            axes_y_min, axes_y_max = min_y - 1, max_y + 1
-        else:
-            if rdn: random.seed()
-            else: random.seed(a=seed)
-            axes_x_min, axes_x_max = 0, 20
-            axes_y_min, axes_y_max = 0, 20
-            points = self.randomize_points(axes_x_min, axes_x_max, axes_y_min, axes_y_max, num_rand_points)
-
-        axes = Axes(
-                x_range=(axes_x_min, axes_x_max),
-                y_range=(axes_y_min, axes_y_max),
-                x_length=10,
-                y_length=6,
-                axis_config={
-                    "stroke_color": GREY_A,
-                    "stroke_width": 2,
-                    },
-                )
-        points = [mPoint(x, y, axes) for (x, y) in points]
+        with self.phase("load points"):
+            if points_file != "":
+                points, min_x, max_x, min_y, max_y = self.load_points(points_file)
+                axes_x_min, axes_x_max = min_x - 1, max_x + 1
+                axes_y_min, axes_y_max = min_y - 1, max_y + 1
+            else:
+                if rdn: random.seed()
+                else: random.seed(a=seed)
+                axes_x_min, axes_x_max = 0, 20
+                axes_y_min, axes_y_max = 0, 20
+                points = self.randomize_points(axes_x_min, axes_x_max, axes_y_min, axes_y_max, num_rand_points)
+
+        with self.phase("axes"):
+            axes = rendering.axes((axes_x_min, axes_x_max), (axes_y_min, axes_y_max))
+        with self.phase("mobjects"):
+            point_set = PointSet.from_pairs(points, axes)
+            points = point_set.mpoints()
 
         self.play(Write(axes), run_time=animation_speed)
 
         self.play(
-                LaggedStart(
-                    *[Write(p.point) for p in points],
-                    lag_ratio=1 / len(points)
-                    ),
+                self.introduce_points(point_set, axes),
                     run_time=animation_speed
                 )
 
+        with self.phase("degeneracy"):
+            degenerate = hull.is_degenerate(point_set)
+        if degenerate:
+            self.play_degenerate(point_set, axes)
+            return
+
+        if cull:
+            with self.phase("cull"):
+                points = self.cull_points(point_set, points)
+
+        if replay != "":
+            with self.phase("trace"):
+                trace = self.algorithm_trace(point_set, replay)
+            self.play_trace(trace, point_set, axes)
+            return
+
         random_points = random.choices(points, k=3)
         avg_x = sum([p.x for p in random_points]) / len(random_points)
         avg_y = sum([p.y for p in random_points]) / len(random_points)
@@ -59,17 +90,8 @@ class GrahamScan(Scene):
         
         hull_points = []
         hull_lines = []
-        avg_label = Tex(fr"median=({avg_point.x:.2f}, {avg_point.y:.2f})", color=WHITE)
-        avg_label.next_to(avg_point.point, UP)
-        label_box = Rectangle(
-                width=avg_label.width + 0.25,
-                height=avg_label.height + 0.25,
-                color=WHITE,
-                fill_color=WHITE,
-                fill_opacity=0.1
-                )
-        label_box.next_to(avg_label, ORIGIN)
-        avg_label = VGroup(avg_label, label_box)
+        with self.phase("labels"):
+            avg_label = rendering.label(fr"median=({avg_point.x:.2f}, {avg_point.y:.2f})", avg_point.point)
         self.play(
                 Write(avg_point.point),
                 *[ReplacementTransform(rdn_pt.point, rdn_pt.set_color(BLUE).point) for rdn_pt in random_points],
@@ -84,28 +106,12 @@ class GrahamScan(Scene):
                 )
         
         # Construct x_min, perform Jarvis, add two points and first line to hull
-        x_min = None
-        for point in points:
-            if x_min is None:
-                x_min = point
-                continue
-            if x_min.x == point.x and x_min.y < point.y:
-                x_min = point
-            if x_min.x > point.x:
-                x_min = point
-        
+        with self.phase("extreme point"):
+            x_min = point_set.mpoint(point_set.leftmost())
+
         hull_points.append(x_min)
-        min_label = Tex(fr"min=({x_min.x}, {x_min.y})", color=WHITE)
-        min_label.next_to(x_min.point, UP)
-        label_box = Rectangle(
-                width=min_label.width + 0.25,
-                height=min_label.height + 0.25,
-                color=WHITE,
-                fill_color=WHITE,
-                fill_opacity=0.1
-                )
-        label_box.next_to(min_label, ORIGIN)
-        min_label = VGroup(min_label, label_box)
+        with self.phase("labels"):
+            min_label = rendering.label(fr"min=({x_min.x}, {x_min.y})", x_min.point)
         self.play(
                 ReplacementTransform(x_min.point, x_min.point.set_color(BLUE)),
                 FadeIn(min_label, scale=0.5),
@@ -118,93 +124,97 @@ class GrahamScan(Scene):
                 )
         
         # Preprocess, sort lines after constructing first hull line
-        lines = self.construct_lines_from_point(x_min, points)
-        max_slope = self.get_max_slope(lines)
-        hull_points.append(max_slope.end)
-        hull_lines.append(max_slope)
+        with self.phase("fan-out"):
+            lines = self.construct_lines_from_point(x_min, points)
+            max_slope = self.get_max_slope(lines)
+            hull_points.append(max_slope.end)
+            hull_lines.append(max_slope)
 
-        self.play(
-                LaggedStart(
-                    *[Write(l.line) for l in lines],
-                    lag_ratio=0.25
-                    ),
-                run_time=animation_speed
-                )
+        with self.step():
+            self.play(
+                    LaggedStart(
+                        *[Write(l.line) for l in self.visible_lines(lines, hull_lines)],
+                        lag_ratio=0.25
+                        ),
+                    run_time=animation_speed
+                    )
+
+            if wait: self.wait()
+            self.play(
+                    LaggedStart(
+                        *[Uncreate(l.line) for l in self.visible_lines(lines, hull_lines) if l not in hull_lines],
+                        lag_ratio=0.25
+                        ),
+                    run_time=animation_speed
+                    )
+            new_hull_point = Dot(color=BLUE).move_to(axes.c2p(max_slope.end.x, max_slope.end.y))
+            self.play(ReplacementTransform(max_slope.end.point, new_hull_point), run_time=animation_speed)
+
+        with self.phase("fan-out"):
+            lines = self.construct_lines_from_point(avg_point, points)
+        with self.phase("sort"):
+            start_line = mLine(avg_point, hull_lines[-1].end)
+            order = self.construct_angles_wrt_line(start_line, lines)
+            lines = [lines[i] for i in order]
+            shift = 1
+            for i in range(len(lines) - 1):
+                if lines[i].end == hull_lines[-1].end:
+                    break
+                shift += 1
+            lines = lines[shift:] + lines[:shift]
 
-        if wait: self.wait()
-        self.play(
-                LaggedStart(
-                    *[Uncreate(l.line) for l in lines if l not in hull_lines],
-                    lag_ratio=0.25
-                    ),
-                run_time=animation_speed
-                )
-        new_hull_point = Dot(color=BLUE).move_to(axes.c2p(max_slope.end.x, max_slope.end.y))
-        self.play(ReplacementTransform(max_slope.end.point, new_hull_point), run_time=animation_speed)
-
-        lines = self.construct_lines_from_point(avg_point, points)
-        start_line = mLine(avg_point, hull_lines[-1].end)
-        lines = self.construct_angles_wrt_line(start_line, lines)
-        shift = 1
-        for i in range(len(lines) - 1):
-            if lines[i].end == hull_lines[-1].end:
-                break
-            shift += 1
-        lines = lines[shift:] + lines[:shift]
-        
         self.play(Write(lines[0].line), run_time=animation_speed)
         i = 0
         break_next = False
         considering_point = lines[0].end
 
         # While the point we're considering is not the first point in our hull
-        while considering_point != hull_points[0]:
-            considering_point = lines[i].end
-            if break_next: break
-            if considering_point == hull_points[0]: break_next = True
-
-            # Update considering point ray
-            if i > 0:
-                self.remove(lines[i - 1].line)
-                self.play(ReplacementTransform(lines[i - 1].line, lines[i].line), run_time=animation_speed)
-
-            # Update considering hull line
-            hull_lines.append(mLine(hull_points[-1], considering_point))
-            self.play(Write(hull_lines[-1].line), run_time=animation_speed)
-
-            # If we have a left turn
-            while hull_lines[-2].is_left_turn_to(hull_lines[-1]):
-                removing_point = hull_points.pop()
-                removing_latest_hull = hull_lines.pop()
-                removing_prev_hull = hull_lines.pop()
-                self.play(
-                    LaggedStart(
-                        *[
-                            ReplacementTransform(
-                                removing_point.point,
-                                removing_point.point.set_color(RED)
+        with self.phase("scan loop"):
+            while considering_point != hull_points[0]:
+                with self.step():
+                    considering_point = lines[i].end
+                    if break_next: break
+                    if considering_point == hull_points[0]: break_next = True
+
+                    # Update considering point ray
+                    if i > 0:
+                        self.remove(lines[i - 1].line)
+                        self.play(ReplacementTransform(lines[i - 1].line, lines[i].line), run_time=animation_speed)
+
+                    # Update considering hull line
+                    hull_lines.append(mLine(hull_points[-1], considering_point))
+                    self.play(Write(hull_lines[-1].line), run_time=animation_speed)
+
+                    # If we have a left turn
+                    while hull_lines[-2].is_left_turn_to(hull_lines[-1]):
+                        removing_point = hull_points.pop()
+                        removing_latest_hull = hull_lines.pop()
+                        removing_prev_hull = hull_lines.pop()
+                        self.play(
+                            LaggedStart(
+                                *[
+                                    self.retire_point(removing_point),
+                                    Unwrite(removing_latest_hull.line),
+                                    Unwrite(removing_prev_hull.line),
+                                ],
+                                lag_ratio=1 / 3
                             ),
-                            Unwrite(removing_latest_hull.line),
-                            Unwrite(removing_prev_hull.line),
-                        ],
-                        lag_ratio=1 / 3
-                    ),
-                    run_time=animation_speed
-                )
-                hull_lines.append(mLine(hull_points[-1], lines[i].end))
-                self.play(Write(hull_lines[-1].line), run_time=animation_speed)
-            
-            # Change new hull point color to blue
-            hull_points.append(lines[i].end)
-            self.play(
-                ReplacementTransform(
-                    lines[i].end.point,
-                    lines[i].end.point.set_color(BLUE)
-                ),
-                run_time=animation_speed
-            )
-            i += 1
-        
+                            run_time=animation_speed
+                        )
+                        hull_lines.append(mLine(hull_points[-1], lines[i].end))
+                        self.play(Write(hull_lines[-1].line), run_time=animation_speed)
+
+                    # Change new hull point color to blue
+                    hull_points.append(lines[i].end)
+                    self.play(
+                        ReplacementTransform(
+                            lines[i].end.point,
+                            lines[i].end.point.set_color(BLUE)
+                        ),
+                        run_time=animation_speed
+                    )
+                    i += 1
+
         self.play(Unwrite(lines[i - 1].line), run_time=animation_speed)
         self.play(
             LaggedStart(
@@ -219,42 +229,28 @@ class GrahamScan(Scene):
             run_time=animation_speed
         )
 
+    def cull_points(self, point_set, points:List[mPoint]) -> List[mPoint]:
+        # Fade out every point strictly inside the polygon of extreme points
+        keep = hull.cull_interior(point_set)
+        if self.lod:
+            self.play(self.shrink_cloud(point_set, point_set.axes, keep), run_time=animation_speed)
+            return [points[i] for i in keep]
+        keep = set(keep.tolist())
+        culled = [p for i, p in enumerate(points) if i not in keep]
+        if len(culled) > 0:
+            self.play(*[FadeOut(p.point) for p in culled], run_time=animation_speed)
+        return [p for i, p in enumerate(points) if i in keep]
+
     def get_bounds(self, points):
-        x_min = None
-        x_max = None
-        y_min = None
-        y_max = None
-        for point in points:
-            x, y = point[0], point[1]
-            if x_min is None:
-                x_min = x
-                x_max = x
-            if y_min is None:
-                y_min = y
-                y_max = y
-            if x_min > x: x_min = x
-            if x_max < x: x_max = x
-            if y_min > y: y_min = y
-            if y_max < y: y_max = y
-        return x_min, x_max, y_min, y_max
+        return PointSet.from_pairs(points).bounds()
 
     def parse_args(self, axes, pairs):
-        points = {}
-        for pair in pairs:
-            x, y = [int(z) for z in pair.split(',')]
-            coords = f"{x}-{y}"
-            if coords in points: continue
-            points[coords] = mPoint(x, y, axes)
-            return list(points.values())
-
-    def randomize_points(self, min_x:int, max_x:int, min_y:int, max_y:int, num:int) -> List[mPoint]:
-        points = {}
-        while len(points) < num:
-            (x, y) = random.randint(min_x + 1, max_x - 1), random.randint(min_y + 1, max_y - 1)
-            coords = f"{x}-{y}"
-            if coords in points: continue
-            points[coords] = (x, y)
-        return list(points.values())
+        coords = np.array([[int(z) for z in pair.split(',')] for pair in pairs], dtype=np.int64).reshape(-1, 2)
+        xs, ys, _ = point_io.unique_points(coords[:, 0], coords[:, 1])
+        return [mPoint(x, y, axes) for x, y in zip(xs.tolist(), ys.tolist())]
+
+    def randomize_points(self, min_x:int, max_x:int, min_y:int, max_y:int, num:int) -> np.ndarray:
+        return point_gen.grid_points(num, min_x, max_x, min_y, max_y, distribution, None if rdn else seed)
 
     def construct_lines_from_point(self, origin:mPoint, points:List[mPoint]) -> List[mLine]:
         lines = []
@@ -265,26 +261,28 @@ class GrahamScan(Scene):
             # slope = dy/dx
             if dx == 0:
                 # Handle vertical slopes    
-                slope = 999999 if dy > 0 else -999999
+                slope = math.inf if dy > 0 else -math.inf
             else:
                 slope = dy / dx
             # magnitude = sqrt(dx^2 + dy^2)
             magnitude = math.sqrt((dx * dx) + (dy * dy))
             line = mLine(origin, point)
-            line.line.set_color(BLUE)
+            line.set_color(BLUE)
             line.set_slope(slope)
             line.set_mag(magnitude)
             lines.append(line)
 
-        lines = sorted(lines, key=lambda l: l.get_slope(), reverse=True)
+        lines = sorted(lines, key=functools.cmp_to_key(mLine.compare_slope), reverse=True)
         return lines
     
-    def construct_angles_wrt_line(self, wrt:mLine, lines:List[mLine]) -> List[mLine]:
-        for line in lines:
-            line.set_angle(wrt.get_angle_to(line))
-        
-        lines = sorted(lines, key=lambda l: l.get_angle(), reverse=True)
-        return lines
+    def construct_angles_wrt_line(self, wrt:mLine, lines:List[mLine]) -> np.ndarray:
+        # Permutation sorting the lines by descending wrt.get_angle_to(line),
+        # exact and in one pass over the coordinates; collinear lines come
+        # nearest first
+        dx = np.array([l.end.x - l.start.x for l in lines])
+        dy = np.array([l.end.y - l.start.y for l in lines])
+        (ux, uy) = wrt.to_vector().tolist()
+        return hull.angular_order(dx, dy, 0, 0, ux, uy)
 
     def get_max_slope(self, lines:List[mLine]) -> mLine:
         max_slope = None
@@ -292,26 +290,23 @@ class GrahamScan(Scene):
             if max_slope is None:
                 max_slope = line
                 continue
-            if max_slope.get_slope() < line.get_slope():
+            # Exact comparisons, rounded slopes can tie or invert
+            slope = line.compare_slope(max_slope)
+            if slope > 0:
                 max_slope = line
                 continue
 
             # Case for co-linearity, we would pick the slope with largest magnitude.
-            if max_slope.get_slope() == line.get_slope() and max_slope.get_mag() < line.get_mag():
+            if slope == 0 and line.compare_length(max_slope) > 0:
                 max_slope = line
                 continue
 
         return max_slope
 
     def load_points(self, filename:str):
-        points = []
-        with open(filename) as f:
-            raw = f.readlines()
-            for line in raw:
-                if line == "": continue
-                [x, y] = line.split(" ")
-                points.append((int(x), int(y)))
-        min_x, max_x, min_y, max_y = self.get_bounds(points)
+        # Repeated points would be collinear with every line through them
+        xs, ys, (min_x, max_x, min_y, max_y) = point_io.load_points(filename, unique=True)
+        points = np.column_stack((xs, ys))
         return points, min_x, max_x, min_y, max_y
     
     def debug(self, obj, color) -> None:
@@ -320,5 +315,5 @@ class GrahamScan(Scene):
     def debug_lines(self, lines:List[mLine]) -> None:
         line_colors = color_gradient([RED, BLUE], len(lines))
         for i, line in enumerate(lines):
-            line.line.set_color(line_colors[i])
+            line.set_color(line_colors[i])
         self.play(LaggedStart(*[Write(l.line) for l in lines]))
\ No newline at end of file
@@ -0,0 +1,370 @@
+import bisect
+import functools
+import numpy as np
+
+import predicates
+cross = predicates.cross
+
+# Pure computation side of the convex hull scenes.
+# Nothing in here imports manim or builds mobjects, so it can be used from
+# batch jobs on plain lists of (x, y) tuples or (n, 2) NumPy arrays.
+# All hulls are returned as indices into the input, in clockwise order,
+# starting from the leftmost point (ties broken by the largest y), which is
+# the same order the GrahamScan and JarvisMarch scenes build them in.
+
+def as_xy(points):
+    # PointSet (or anything else with coordinate columns) is used as is.
+    # Narrower or unsigned integer columns are widened to int64, the engines'
+    # differences would wrap in them.
+    widen = predicates.widen
+    if hasattr(points, "xs") and hasattr(points, "ys"):
+        return widen(np.asarray(points.xs)), widen(np.asarray(points.ys))
+    arr = np.asarray(points)
+    if arr.size == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    if arr.ndim != 2 or arr.shape[1] < 2:
+        raise ValueError(f"Expected a sequence of (x, y) pairs, got shape {arr.shape}")
+    return widen(arr[:, 0]), widen(arr[:, 1])
+
+def bounds(points):
+    xs, ys = as_xy(points)
+    if len(xs) == 0:
+        return None, None, None, None
+    return xs.min().item(), xs.max().item(), ys.min().item(), ys.max().item()
+
+def leftmost(points) -> int:
+    return _leftmost(*as_xy(points))
+
+def rightmost(points) -> int:
+    return _rightmost(*as_xy(points))
+
+def _leftmost(xs, ys) -> int:
+    # Smallest x, largest y amongst ties
+    candidates = np.flatnonzero(xs == xs.min())
+    return int(candidates[np.argmax(ys[candidates])])
+
+def _rightmost(xs, ys) -> int:
+    # Largest x, smallest y amongst ties
+    candidates = np.flatnonzero(xs == xs.max())
+    return int(candidates[np.argmin(ys[candidates])])
+
+def graham_scan(points) -> np.ndarray:
+    xs, ys = as_xy(points)
+    n = len(xs)
+    if n < 3:
+        return _small_hull(xs, ys)
+
+    # Clockwise from straight up, nearest first along each ray. Copies of
+    # the pivot would look collinear with every edge leaving it.
+    pivot = _leftmost(xs, ys)
+    order = angular_order(xs, ys, xs[pivot], ys[pivot], 0, -1)
+    order = order[(xs[order] != xs[pivot]) | (ys[order] != ys[pivot])]
+
+    hull = [pivot]
+    x, y = xs.tolist(), ys.tolist()
+    for i in order.tolist():
+        # Clockwise scan, pop anything that is not a right turn
+        while len(hull) > 1 and cross(x[hull[-2]], y[hull[-2]], x[hull[-1]], y[hull[-1]], x[i], y[i]) >= 0:
+            hull.pop()
+        hull.append(i)
+    return np.array(hull, dtype=np.int64)
+
+def angular_order(xs, ys, ox, oy, ux, uy) -> np.ndarray:
+    # Permutation sorting the points around (ox, oy) by descending counter
+    # clockwise angle from the direction (ux, uy), in (-180, 180] degrees:
+    # clockwise, starting from the direction opposite (ux, uy). Points at the
+    # same angle are ordered by distance, then by index. No angles are
+    # computed: each point falls in one of four classes (opposite, left of,
+    # along, right of the direction), and within the two open half planes
+    # the cotangent dot / cross only shrinks as the angle grows. That float
+    # key is only a first pass: every adjacent pair is then checked with the
+    # exact predicates and, should rounding have swapped any, the nearly
+    # sorted order is finished with an exact comparison sort. Those turns are
+    # taken about (ox, oy) from the coordinates themselves, as float
+    # differences from it are rounded, and along one ray the nearer point is
+    # the one nearer in x, then in y, with copies of (ox, oy) first.
+    xs, ys = np.asarray(xs), np.asarray(ys)
+    vx, vy = xs - ox, ys - oy
+    c = cross(0, 0, ux, uy, vx, vy)
+    d = predicates.dot(-ux, -uy, 0, 0, vx, vy)
+    half = np.select([c > 0, c < 0, d < 0], [1, 3, 0], 2).astype(np.int8)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        key = np.where(c != 0, np.asarray(d, dtype=np.float64) / np.where(c != 0, c, 1), 0.0)
+    reach = np.abs(vx) + np.abs(vy)
+    order = np.argsort(key)
+    order = order[np.argsort(half[order], kind="stable")]
+
+    h, k = half[order], key[order]
+    tied = (h[1:] == h[:-1]) & (k[1:] == k[:-1])
+    if tied.any():
+        _order_ties(order, tied, reach)
+
+    # Below 2^26 dot and cross are exact in floats and so is the order
+    integral = vx.dtype.kind in "iu" and vy.dtype.kind in "iu" and isinstance(ux, (int, np.integer)) and isinstance(uy, (int, np.integer))
+    if integral and max(abs(int(ux)), abs(int(uy)), int(reach.max(initial=0))) < 1 << 26:
+        return order
+    far, px, py = reach != 0, np.sign(vx) * xs, np.sign(vy) * ys
+    a, b = order[:-1], order[1:]
+    turn = cross(ox, oy, xs[a], ys[a], xs[b], ys[b])
+    same = (far[a] == far[b]) & (px[a] == px[b])
+    nearer = (far[a] < far[b]) | (same & (py[a] < py[b])) | ((far[a] == far[b]) & (px[a] < px[b]))
+    before = (half[a] < half[b]) | ((half[a] == half[b]) & (
+        (turn < 0) | ((turn == 0) & (nearer | (same & (py[a] == py[b]) & (a < b))))
+    ))
+    if not before.all():
+        order = _exact_angular_sort(order, half, xs, ys, ox, oy, (far, px, py))
+    return order
+
+def _order_ties(order, tied, reach) -> None:
+    # Runs of equal class and key, nearest first, then by index, in place
+    start = np.ones(len(order), dtype=bool)
+    start[1:] = ~tied
+    starts = np.flatnonzero(start)
+    member = np.zeros(len(order), dtype=bool)
+    member[1:] |= tied
+    member[:-1] |= tied
+    pos = np.flatnonzero(member)
+    run = np.searchsorted(starts, pos, side="right") - 1
+    idx = order[pos]
+    order[pos] = idx[np.lexsort((idx, reach[idx], run))]
+
+def _exact_angular_sort(order, half, xs, ys, ox, oy, distance) -> np.ndarray:
+    h, x, y = half.tolist(), xs.tolist(), ys.tolist()
+    r = list(zip(*[column.tolist() for column in distance]))
+    ox, oy = ox.item() if hasattr(ox, "item") else ox, oy.item() if hasattr(oy, "item") else oy
+    def compare(a, b):
+        if h[a] != h[b]: return h[a] - h[b]
+        turn = cross(ox, oy, x[a], y[a], x[b], y[b])
+        if turn != 0: return -1 if turn < 0 else 1
+        return (r[a] > r[b]) - (r[a] < r[b]) or a - b
+    return np.array(sorted(order.tolist(), key=functools.cmp_to_key(compare)), dtype=np.int64)
+
+def jarvis_march(points) -> np.ndarray:
+    xs, ys = as_xy(points)
+    n = len(xs)
+    if n < 3:
+        return _small_hull(xs, ys)
+
+    start = _leftmost(xs, ys)
+    turn = predicates.cross_for(xs, ys)
+    hull = [start]
+    current = start
+    while True:
+        # Copies of the current point are collinear with everything, start
+        # from any other point
+        others = np.flatnonzero((xs != xs[current]) | (ys != ys[current]))
+        if len(others) == 0: break
+        candidate = int(others[0])
+        for _ in range(n + 1):
+            turns = turn(xs[current], ys[current], xs[candidate], ys[candidate], xs, ys)
+            best = int(np.argmax(turns))
+            if turns[best] <= 0: break
+            # Some point lies left of current -> candidate, wrap further
+            candidate = best
+        else:
+            # Each wrap moves strictly clockwise, exact predicates end it
+            # within n steps
+            raise RuntimeError("jarvis_march did not converge, the orientation predicates are inconsistent")
+
+        # Of the collinear candidates pick the furthest one. They all lie on
+        # one ray from current, so the most extreme x (or y, if the ray is
+        # vertical) is the furthest, with no arithmetic that could overflow
+        collinear = np.flatnonzero(turns == 0)
+        along = xs if xs[candidate] != xs[current] else ys
+        reach = along[collinear]
+        candidate = int(collinear[np.argmax(reach) if along[candidate] > along[current] else np.argmin(reach)])
+        if (xs[candidate] == xs[start] and ys[candidate] == ys[start]) or len(hull) > n: break
+        hull.append(candidate)
+        current = candidate
+    return np.array(hull, dtype=np.int64)
+
+def monotone_chain(points) -> np.ndarray:
+    xs, ys = as_xy(points)
+    if len(xs) < 3:
+        return _small_hull(xs, ys)
+
+    # Sorted by x, then by descending y, so the upper chain runs from the
+    # leftmost point to the rightmost like JarvisMarch's op.ge pass and the
+    # reversed order gives the lower chain like its op.le pass.
+    order = np.lexsort((-ys, xs)).tolist()
+    x, y = xs.tolist(), ys.tolist()
+    upper = _chain(x, y, order)
+    lower = _chain(x, y, order[::-1])
+    return np.array(upper[:-1] + lower[:-1], dtype=np.int64)
+
+def chan(points) -> np.ndarray:
+    xs, ys = as_xy(points)
+    n = len(xs)
+    if n < 3:
+        return _small_hull(xs, ys)
+
+    # Guess the hull size m, squaring the guess until the march completes
+    # within m steps. This keeps the whole run at O(n log h).
+    x, y = xs.tolist(), ys.tolist()
+    t = 1
+    while True:
+        m = min(1 << (1 << t), n)
+        hull = _chan_attempt(xs, ys, x, y, m)
+        if hull is not None:
+            return np.array(hull, dtype=np.int64)
+        if m == n:
+            # No hull has more than n vertices
+            raise RuntimeError("chan did not converge, the orientation predicates are inconsistent")
+        t += 1
+
+def _chan_attempt(xs, ys, x, y, m:int):
+    n = len(x)
+    upper_groups, lower_groups = [], []
+    for lo in range(0, n, m):
+        group = np.arange(lo, min(lo + m, n))
+        order = group[np.lexsort((-ys[group], xs[group]))].tolist()
+        upper = _chain(x, y, order)
+        lower = _chain(x, y, order[::-1])
+        upper_groups.append(([(x[i], -y[i]) for i in upper], upper))
+        lower_groups.append(([(-x[i], y[i]) for i in lower], lower))
+
+    start = _leftmost(xs, ys)
+    upper = _march_chains(x, y, upper_groups, start, lambda i: (x[i], -y[i]), m)
+    if upper is None: return None
+    lower = _march_chains(x, y, lower_groups, upper[-1], lambda i: (-x[i], y[i]), m - len(upper) + 2)
+    if lower is None: return None
+    return upper[:-1] + lower[:-1]
+
+def _march_chains(x, y, groups, start:int, key, limit:int):
+    # Gift wrap over the precomputed group chains. Only vertices ordered
+    # after the current point are candidates, and on each group chain the
+    # best of those is found by binary searching for the tangent.
+    chain = [start]
+    current = start
+    while True:
+        px, py = x[current], y[current]
+        pkey = key(current)
+        best = None
+        for keys, vertices in groups:
+            lo = bisect.bisect_right(keys, pkey)
+            if lo == len(vertices): continue
+            hi = len(vertices) - 1
+            while lo < hi:
+                mid = (lo + hi) // 2
+                a, b = vertices[mid], vertices[mid + 1]
+                if cross(px, py, x[a], y[a], x[b], y[b]) >= 0: lo = mid + 1
+                else: hi = mid
+            candidate = vertices[lo]
+            if best is None:
+                best = candidate
+                continue
+            turn = cross(px, py, x[best], y[best], x[candidate], y[candidate])
+            if turn > 0 or (turn == 0 and _dist(x, y, current, candidate) > _dist(x, y, current, best)):
+                best = candidate
+        if best is None:
+            return chain
+        if len(chain) >= limit:
+            return None
+        chain.append(best)
+        current = best
+
+def _chain(x, y, order) -> list:
+    # Clockwise chain over already sorted indices
+    chain = []
+    for i in order:
+        while len(chain) > 1 and cross(x[chain[-2]], y[chain[-2]], x[chain[-1]], y[chain[-1]], x[i], y[i]) >= 0:
+            chain.pop()
+        chain.append(i)
+    return chain
+
+def _dist(x, y, a:int, b:int):
+    dx, dy = x[b] - x[a], y[b] - y[a]
+    return dx * dx + dy * dy
+
+def cull_interior(points) -> np.ndarray:
+    # Akl-Toussaint heuristic. The points extreme in x, y, x + y and x - y
+    # span a polygon inside the hull, anything strictly inside it can be
+    # dropped before running a hull engine. Returns the indices kept.
+    xs, ys = as_xy(points)
+    n = len(xs)
+    if n < 9:
+        return np.arange(n)
+    polygon = _extreme_polygon(xs, ys)
+    if len(polygon) < 3:
+        return np.arange(n)
+
+    turn = predicates.cross_for(xs, ys)
+    inside = np.ones(n, dtype=bool)
+    for a, b in zip(polygon, polygon[1:] + polygon[:1]):
+        # Clockwise polygon, interior points are strictly right of every edge
+        inside &= turn(xs[a], ys[a], xs[b], ys[b], xs, ys) < 0
+    return np.flatnonzero(~inside)
+
+def _extreme_polygon(xs, ys) -> list:
+    s, d = xs + ys, xs - ys
+    # Clockwise from the left: left, upper left, top, upper right, right,
+    # lower right, bottom, lower left
+    candidates = [
+        int(np.argmin(xs)), int(np.argmin(d)), int(np.argmax(ys)), int(np.argmax(s)),
+        int(np.argmax(xs)), int(np.argmax(d)), int(np.argmin(ys)), int(np.argmin(s)),
+    ]
+    polygon = []
+    for i in candidates:
+        if polygon and xs[polygon[-1]] == xs[i] and ys[polygon[-1]] == ys[i]: continue
+        polygon.append(i)
+    while len(polygon) > 1 and xs[polygon[0]] == xs[polygon[-1]] and ys[polygon[0]] == ys[polygon[-1]]:
+        polygon.pop()
+    return polygon
+
+ENGINES = {
+    "graham": graham_scan,
+    "jarvis": jarvis_march,
+    "monotone": monotone_chain,
+    "chan": chan,
+}
+
+def is_degenerate(points) -> bool:
+    # Fewer than 3 distinct points, or all of them on one line. The hull is
+    # then _small_hull's one or two points.
+    xs, ys = as_xy(points)
+    if len(xs) < 3:
+        return True
+    lo, hi = _leftmost(xs, ys), _rightmost(xs, ys)
+    if xs[lo] == xs[hi] and ys[lo] == ys[hi]:
+        return True
+    # Most inputs already leave the line within the first few points
+    head = slice(0, 64)
+    if np.any(cross(xs[lo], ys[lo], xs[hi], ys[hi], xs[head], ys[head]) != 0):
+        return False
+    return not np.any(cross(xs[lo], ys[lo], xs[hi], ys[hi], xs, ys) != 0)
+
+def convex_hull(points, engine:str="monotone", cull:bool=False) -> np.ndarray:
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown hull engine {engine!r}, expected one of {sorted(ENGINES)}")
+    if is_degenerate(points):
+        return _small_hull(*as_xy(points))
+    if not cull:
+        return ENGINES[engine](points)
+    xs, ys = as_xy(points)
+    keep = cull_interior(points)
+    return keep[ENGINES[engine](np.column_stack((xs[keep], ys[keep])))]
+
+def hull_chains(points, engine:str="monotone", cull:bool=False):
+    # Split a hull into its upper chain (leftmost to rightmost point) and its
+    # lower chain (rightmost back to leftmost), both including the endpoints.
+    return split_chains(points, convex_hull(points, engine, cull))
+
+def split_chains(points, hull):
+    # hull_chains for hull indices computed elsewhere
+    xs, ys = as_xy(points)
+    hull = np.asarray(hull, dtype=np.int64)
+    if len(hull) < 2:
+        return hull, hull
+    # Rightmost hull vertex, smallest y amongst ties
+    split = int(np.lexsort((ys[hull], -xs[hull]))[0])
+    upper = hull[:split + 1]
+    lower = np.concatenate((hull[split:], hull[:1]))
+    return upper, lower
+
+def _small_hull(xs, ys) -> np.ndarray:
+    if len(xs) == 0:
+        return np.empty(0, dtype=np.int64)
+    lo, hi = _leftmost(xs, ys), _rightmost(xs, ys)
+    if lo == hi or (xs[lo] == xs[hi] and ys[lo] == ys[hi]):
+        return np.array([lo], dtype=np.int64)
+    return np.array([lo, hi], dtype=np.int64)
@@ -0,0 +1,239 @@
+import sys
+import numpy as np
+
+import predicates
+orient3d = predicates.orient3d
+
+# 3D convex hulls with quickhull, the 3D counterpart of hull.py: no manim,
+# points as (n, 3) arrays or x, y, z columns.
+# The hull is a triangulated surface kept in NumPy arrays:
+#   faces      (m, 3) point indices, counter clockwise seen from outside
+#   neighbors  (m, 3) neighbors[f, i] is the face across the edge from
+#              faces[f, i] to faces[f, (i + 1) % 3]
+# Every face keeps the outside set of points strictly above it. Each step
+# takes the furthest point of one outside set (the eye), removes the faces
+# it sees, closes the hole with a fan of faces from the horizon to the eye
+# and hands the removed faces' outside sets to the new faces. Points on or
+# below every face are dropped, so coplanar points are not vertices and
+# coplanar facets may be split into several triangles. Expected running time
+# is O(n log n).
+
+class Hull3D:
+    xs: np.ndarray
+    ys: np.ndarray
+    zs: np.ndarray
+    faces: np.ndarray
+    neighbors: np.ndarray
+    alive: np.ndarray
+    outside: list
+    count: int
+
+    def __init__(self, points) -> None:
+        self.xs, self.ys, self.zs = as_xyz(points)
+        self.faces = np.empty((16, 3), dtype=np.int64)
+        self.neighbors = np.empty((16, 3), dtype=np.int64)
+        self.alive = np.zeros(16, dtype=bool)
+        self.outside = [None] * 16
+        self.count = 0
+
+    def steps(self):
+        # Builds the hull, yielding (eye, removed, added) for every step:
+        # the initial tetrahedron comes with eye -1 and no removed faces.
+        # removed and added are face ids, removed faces stay readable in
+        # self.faces until the end of the step.
+        simplex = _simplex(self.xs, self.ys, self.zs)
+        added = self._start(simplex)
+        yield -1, np.empty(0, dtype=np.int64), added
+
+        pending = added.tolist()
+        while pending:
+            f = pending.pop()
+            if not self.alive[f] or len(self.outside[f]) == 0:
+                continue
+            eye = self._furthest(f)
+            visible, horizon = self._horizon(f, eye)
+            points = np.concatenate([self.outside[v] for v in visible])
+            points = points[points != eye]
+            for v in visible:
+                self.alive[v] = False
+                self.outside[v] = None
+            added = self._fan(eye, horizon)
+            self._partition(points, added)
+            pending.extend(added.tolist())
+            yield eye, np.array(visible, dtype=np.int64), added
+
+    def run(self) -> "Hull3D":
+        for _ in self.steps():
+            pass
+        return self
+
+    def hull_faces(self) -> np.ndarray:
+        return self.faces[:self.count][self.alive[:self.count]]
+
+    def hull_neighbors(self) -> np.ndarray:
+        # neighbors renumbered to index hull_faces()
+        ids = np.flatnonzero(self.alive[:self.count])
+        renumber = np.full(self.count, -1, dtype=np.int64)
+        renumber[ids] = np.arange(len(ids))
+        return renumber[self.neighbors[ids]]
+
+    def vertices(self) -> np.ndarray:
+        return np.unique(self.hull_faces())
+
+    def above(self, f:int, points:np.ndarray) -> np.ndarray:
+        # orient3d of points against face f, > 0 above it
+        a, b, c = self.faces[f]
+        xs, ys, zs = self.xs, self.ys, self.zs
+        return orient3d(
+            xs[a], ys[a], zs[a],
+            xs[b], ys[b], zs[b],
+            xs[c], ys[c], zs[c],
+            xs[points], ys[points], zs[points]
+        )
+
+    def _add_face(self, a:int, b:int, c:int) -> int:
+        if self.count == len(self.faces):
+            grow = len(self.faces)
+            self.faces = np.concatenate((self.faces, np.empty((grow, 3), dtype=np.int64)))
+            self.neighbors = np.concatenate((self.neighbors, np.empty((grow, 3), dtype=np.int64)))
+            self.alive = np.concatenate((self.alive, np.zeros(grow, dtype=bool)))
+            self.outside.extend([None] * grow)
+        f = self.count
+        self.faces[f] = (a, b, c)
+        self.neighbors[f] = -1
+        self.alive[f] = True
+        self.outside[f] = np.empty(0, dtype=np.int64)
+        self.count += 1
+        return f
+
+    def _start(self, simplex) -> np.ndarray:
+        # Tetrahedron faces turned so the opposite vertex is below them
+        faces = []
+        for k in range(4):
+            a, b, c = [simplex[i] for i in range(4) if i != k]
+            f = self._add_face(a, b, c)
+            if self.above(f, np.array([simplex[k]]))[0] > 0:
+                self.faces[f] = (a, c, b)
+            faces.append(f)
+        edges = {}
+        for f in faces:
+            for i in range(3):
+                edges[(self.faces[f, i], self.faces[f, (i + 1) % 3])] = (f, i)
+        for (u, v), (f, i) in edges.items():
+            self.neighbors[f, i] = edges[(v, u)][0]
+
+        points = np.ones(len(self.xs), dtype=bool)
+        points[list(simplex)] = False
+        added = np.array(faces, dtype=np.int64)
+        self._partition(np.flatnonzero(points), added)
+        return added
+
+    def _furthest(self, f:int) -> int:
+        # Within one face orient3d is the distance scaled by the face's area
+        points = self.outside[f]
+        return int(points[np.argmax(self.above(f, points))])
+
+    def _horizon(self, f:int, eye:int):
+        # Faces seen from the eye (connected, starting from f) and the
+        # edges around them, as (u, v, face beyond the edge, its slot there)
+        eye = np.array([eye])
+        visible = {f}
+        stack = [f]
+        while stack:
+            g = stack.pop()
+            for h in self.neighbors[g].tolist():
+                if h not in visible and self.above(h, eye)[0] > 0:
+                    visible.add(h)
+                    stack.append(h)
+
+        horizon = []
+        for g in visible:
+            for i in range(3):
+                h = int(self.neighbors[g, i])
+                if h not in visible:
+                    u, v = int(self.faces[g, i]), int(self.faces[g, (i + 1) % 3])
+                    horizon.append((u, v, h, int(np.flatnonzero(self.neighbors[h] == g)[0])))
+        return sorted(visible), horizon
+
+    def _fan(self, eye:int, horizon:list) -> np.ndarray:
+        # One face (u, v, eye) per horizon edge, keeping the removed faces'
+        # orientation, linked to the face beyond the edge and to each other
+        starts, ends, added = {}, {}, []
+        for u, v, h, slot in horizon:
+            f = self._add_face(u, v, eye)
+            self.neighbors[f, 0] = h
+            self.neighbors[h, slot] = f
+            starts[u] = f
+            ends[v] = f
+            added.append(f)
+        for u, v, _, _ in horizon:
+            f = starts[u]
+            self.neighbors[f, 1] = starts[v]
+            self.neighbors[f, 2] = ends[u]
+        return np.array(added, dtype=np.int64)
+
+    def _partition(self, points:np.ndarray, faces:np.ndarray) -> None:
+        # Each point goes to the first face it is above, the rest are inside
+        for f in faces.tolist():
+            if len(points) == 0:
+                break
+            above = self.above(f, points) > 0
+            self.outside[f] = points[above]
+            points = points[~above]
+
+def as_xyz(points):
+    if hasattr(points, "xs") and hasattr(points, "ys") and hasattr(points, "zs"):
+        return points.xs, points.ys, points.zs
+    arr = np.asarray(points)
+    if arr.ndim != 2 or arr.shape[1] < 3:
+        raise ValueError(f"Expected a sequence of (x, y, z) triples, got shape {arr.shape}")
+    return arr[:, 0], arr[:, 1], arr[:, 2]
+
+def _simplex(xs, ys, zs) -> tuple:
+    # Four points spanning a tetrahedron: the extremes in x, the point
+    # furthest from their line, then the point furthest from their plane.
+    # Choices use rounded distances, degeneracy is decided exactly.
+    if len(xs) < 4:
+        raise ValueError(f"A 3D hull needs at least 4 points, got {len(xs)}")
+    order = np.lexsort((zs, ys, xs))
+    a, b = int(order[0]), int(order[-1])
+    fx, fy, fz = xs.astype(np.float64), ys.astype(np.float64), zs.astype(np.float64)
+    if fx[a] == fx[b] and fy[a] == fy[b] and fz[a] == fz[b]:
+        b = int(np.argmax((fx - fx[a]) ** 2 + (fy - fy[a]) ** 2 + (fz - fz[a]) ** 2))
+
+    # Rounded choices first, checked exactly on the one candidate
+    px, py, pz = fx - fx[a], fy - fy[a], fz - fz[a]
+    ux, uy, uz = px[b], py[b], pz[b]
+    nx, ny, nz = uy * pz - uz * py, uz * px - ux * pz, ux * py - uy * px
+    c = int(np.argmax(nx * nx + ny * ny + nz * nz))
+    nx, ny, nz = nx[c], ny[c], nz[c]
+    d = int(np.argmax(np.abs(nx * px + ny * py + nz * pz)))
+    if orient3d(xs[a], ys[a], zs[a], xs[b], ys[b], zs[b], xs[c], ys[c], zs[c], xs[d], ys[d], zs[d]) != 0:
+        return a, b, c, d
+
+    # Collinear with a and b exactly when every projection is
+    cross = predicates.cross
+    xy = cross(xs[a], ys[a], xs[b], ys[b], xs, ys)
+    yz = cross(ys[a], zs[a], ys[b], zs[b], ys, zs)
+    zx = cross(zs[a], xs[a], zs[b], xs[b], zs, xs)
+    area = np.abs(np.asarray(xy, dtype=np.float64)) + np.abs(np.asarray(yz, dtype=np.float64)) + np.abs(np.asarray(zx, dtype=np.float64))
+    c = int(np.argmax(area))
+    if area[c] == 0:
+        raise ValueError("Points are collinear, they have no 3D hull")
+
+    volume = np.abs(np.asarray(orient3d(xs[a], ys[a], zs[a], xs[b], ys[b], zs[b], xs[c], ys[c], zs[c], xs, ys, zs), dtype=np.float64))
+    d = int(np.argmax(volume))
+    if volume[d] == 0:
+        raise ValueError("Points are coplanar, they have no 3D hull")
+    return a, b, c, d
+
+def convex_hull_3d(points) -> np.ndarray:
+    # Hull faces as (m, 3) point indices, counter clockwise from outside
+    return Hull3D(points).run().hull_faces()
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit(f"Usage: python {sys.argv[0]} <points file with x y z triples>")
+    import point_io
+    hull3d = Hull3D(np.column_stack(point_io.load_points_3d(sys.argv[1]))).run()
+    print(f"{len(hull3d.xs)} points, {len(hull3d.vertices())} hull vertices, {len(hull3d.hull_faces())} faces")
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import numpy as np
+
+import hull
+import hull_trace
+
+# On-disk cache of computed hulls and algorithm traces.
+# Entries are content addressed: the key hashes the point coordinates
+# together with the algorithm and its options, so renaming or copying a point
+# file still hits and any change to the points misses. Every entry is a hull
+# file (<key>.npy, the hull indices) and optionally a trace file
+# (<key>.trace, see hull_trace.py). A hit refreshes the files' modification
+# time, and once the cache grows past max_bytes the least recently used
+# entries are removed.
+#
+# Usage:
+#   python hull_cache.py            # print the cache directory, entries and size
+#   python hull_cache.py clear
+
+default_dir = os.environ.get("HULL_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "convex-hull"))
+default_max_bytes = 256 << 20
+
+HULL_SUFFIX = ".npy"
+TRACE_SUFFIX = ".trace"
+
+class HullCache:
+    directory: str
+    max_bytes: int
+
+    def __init__(self, directory:str=None, max_bytes:int=None) -> None:
+        self.directory = directory or default_dir
+        self.max_bytes = default_max_bytes if max_bytes is None else max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, points, algorithm:str, **options) -> str:
+        xs, ys = hull.as_xy(points)
+        # Integral coordinates hash the same whatever their dtype, so text and
+        # binary copies of a point file share their entries
+        dtype = np.int64 if xs.dtype.kind in "iub" and ys.dtype.kind in "iub" else np.float64
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(json.dumps([algorithm, options, np.dtype(dtype).str], sort_keys=True).encode())
+        digest.update(np.ascontiguousarray(xs, dtype=dtype).data)
+        digest.update(np.ascontiguousarray(ys, dtype=dtype).data)
+        return digest.hexdigest()
+
+    def path(self, key:str, suffix:str) -> str:
+        return os.path.join(self.directory, key + suffix)
+
+    def get_hull(self, key:str):
+        path = self.path(key, HULL_SUFFIX)
+        try:
+            indices = np.load(path)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        _touch(path)
+        return indices
+
+    def get_trace(self, key:str):
+        path = self.path(key, TRACE_SUFFIX)
+        try:
+            trace = hull_trace.Trace.read(path)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        _touch(path)
+        _touch(self.path(key, HULL_SUFFIX))
+        return trace
+
+    def put_hull(self, key:str, indices, evict:bool=True) -> None:
+        self._write(self.path(key, HULL_SUFFIX), lambda f: np.save(f, np.asarray(indices, dtype=np.int64)), "wb")
+        if evict: self.evict()
+
+    def put_trace(self, key:str, trace, evict:bool=True) -> None:
+        self._write(self.path(key, TRACE_SUFFIX), lambda f: f.writelines(line + "\n" for line in trace.lines()), "w")
+        self.put_hull(key, trace.hull(), evict)
+
+    def hull(self, points, engine:str="monotone", cull:bool=False) -> np.ndarray:
+        # hull.convex_hull, computed only on a miss
+        key = self.key(points, engine, cull=cull)
+        indices = self.get_hull(key)
+        if indices is None:
+            indices = hull.convex_hull(points, engine, cull)
+            self.put_hull(key, indices)
+        return indices
+
+    def trace(self, points, algorithm:str="graham", cull:bool=False):
+        # hull_trace.record, computed only on a miss
+        key = self.key(points, "trace:" + algorithm, cull=cull)
+        trace = self.get_trace(key)
+        if trace is None:
+            trace = hull_trace.record(points, algorithm, cull)
+            self.put_trace(key, trace)
+        return trace
+
+    def entries(self) -> list:
+        # (key, last use, bytes) of every entry, least recently used first
+        entries = {}
+        for entry in os.scandir(self.directory):
+            key, suffix = os.path.splitext(entry.name)
+            if suffix not in (HULL_SUFFIX, TRACE_SUFFIX) or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            used, size = entries.get(key, (0.0, 0))
+            entries[key] = (max(used, stat.st_mtime), size + stat.st_size)
+        return sorted(((k, used, size) for k, (used, size) in entries.items()), key=lambda e: e[1])
+
+    def size(self) -> int:
+        return sum(size for _, _, size in self.entries())
+
+    def evict(self) -> None:
+        entries = self.entries()
+        total = sum(size for _, _, size in entries)
+        for key, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            self.remove(key)
+            total -= size
+
+    def remove(self, key:str) -> None:
+        for suffix in (HULL_SUFFIX, TRACE_SUFFIX):
+            try:
+                os.remove(self.path(key, suffix))
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        for key, _, _ in self.entries():
+            self.remove(key)
+
+    def _write(self, path:str, write, mode:str) -> None:
+        # Write next to the entry and rename it into place, so concurrent
+        # renders never read half written files
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, mode) as f:
+                write(f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+def _touch(path:str) -> None:
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+if __name__ == "__main__":
+    cache = HullCache()
+    if sys.argv[1:] == ["clear"]:
+        cache.clear()
+    elif len(sys.argv) > 1:
+        sys.exit(f"Usage: python {sys.argv[0]} [clear]")
+    else:
+        print(f"{cache.directory}: {len(cache.entries())} entries, {cache.size()} bytes of {cache.max_bytes}")
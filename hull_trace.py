@@ -0,0 +1,193 @@
+import collections
+import json
+import sys
+import numpy as np
+
+import hull
+import predicates
+cross = predicates.cross
+
+# Algorithm traces.
+# A trace is every decision a hull algorithm makes, recorded by a headless
+# pass so the scenes can replay it without running the algorithm themselves.
+# Traces are written as JSON lines: a header object, then one compact array
+# per event.
+#   ["push", i]     point i is added to the end of the hull chain
+#   ["pop", i]      point i, the end of the chain, is removed from it
+#   ["test", a, b]  the edge from point a to point b is tested
+#   ["sweep", x]    the sweep line moves to x
+# Indices refer to the points in the order they were loaded. Replaying the
+# pushes and pops leaves the hull on the chain, in the same clockwise order as
+# hull.py, the closing edge back to the first vertex is implied.
+
+FORMAT = "hull-trace"
+VERSION = 1
+
+PUSH = "push"
+POP = "pop"
+TEST = "test"
+SWEEP = "sweep"
+
+class Trace:
+    algorithm: str
+    n: int
+    options: dict
+    events: list
+
+    def __init__(self, algorithm:str, n:int, options:dict=None, events:list=None) -> None:
+        self.algorithm = algorithm
+        self.n = n
+        self.options = options or {}
+        self.events = events if events is not None else []
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def push(self, i:int) -> None:
+        self.events.append((PUSH, i))
+
+    def pop(self, i:int) -> None:
+        self.events.append((POP, i))
+
+    def test(self, a:int, b:int) -> None:
+        self.events.append((TEST, a, b))
+
+    def sweep(self, x) -> None:
+        self.events.append((SWEEP, x))
+
+    def counts(self) -> dict:
+        return dict(collections.Counter(e[0] for e in self.events))
+
+    def hull(self) -> np.ndarray:
+        chain = []
+        for event in self.events:
+            if event[0] == PUSH:
+                chain.append(event[1])
+            elif event[0] == POP:
+                if len(chain) == 0 or chain[-1] != event[1]:
+                    raise ValueError(f"Trace pops {event[1]} but the end of the chain is {chain[-1] if chain else None}")
+                chain.pop()
+        return np.array(chain, dtype=np.int64)
+
+    def header(self) -> dict:
+        return {"format": FORMAT, "version": VERSION, "algorithm": self.algorithm, "n": self.n, "options": self.options}
+
+    def lines(self):
+        yield json.dumps(self.header(), separators=(",", ":"))
+        for event in self.events:
+            yield json.dumps(event, separators=(",", ":"))
+
+    def write(self, filename:str) -> None:
+        with open(filename, "w") as f:
+            for line in self.lines():
+                f.write(line)
+                f.write("\n")
+
+    @classmethod
+    def read(cls, filename:str) -> "Trace":
+        with open(filename) as f:
+            return cls.parse(f)
+
+    @classmethod
+    def parse(cls, lines) -> "Trace":
+        lines = iter(lines)
+        header = json.loads(next(lines, "null"))
+        if not isinstance(header, dict) or header.get("format") != FORMAT:
+            raise ValueError("Not a hull trace")
+        if header.get("version") != VERSION:
+            raise ValueError(f"Unsupported hull trace version {header.get('version')}")
+        events = [tuple(json.loads(line)) for line in lines if line.strip()]
+        return cls(header["algorithm"], header["n"], header.get("options"), events)
+
+def record(points, algorithm:str="graham", cull:bool=False) -> Trace:
+    # With cull on, the algorithm only sees the points kept by
+    # hull.cull_interior, the events still use indices into all points
+    xs, ys = hull.as_xy(points)
+    trace = Trace(algorithm, len(xs), {"cull": cull})
+    ids = hull.cull_interior(np.column_stack((xs, ys))) if cull else np.arange(len(xs))
+    xs, ys = xs[ids], ys[ids]
+    # One or two distinct points, or a line: only the known hull is pushed
+    if hull.is_degenerate(np.column_stack((xs, ys))):
+        for i in hull._small_hull(xs, ys).tolist():
+            trace.push(int(ids[i]))
+        return trace
+    TRACERS[algorithm](xs, ys, ids.tolist(), trace)
+    return trace
+
+def _scan(trace:Trace, x, y, ids, chain:list, i:int, base:int=0) -> None:
+    # Pop the end of the chain until it makes a clockwise turn to i
+    while len(chain) > base + 1:
+        a, b = chain[-2], chain[-1]
+        trace.test(ids[b], ids[i])
+        if cross(x[a], y[a], x[b], y[b], x[i], y[i]) < 0: break
+        trace.pop(ids[chain.pop()])
+
+def _graham(xs, ys, ids, trace:Trace) -> None:
+    # Same pivot and angular order as hull.graham_scan
+    pivot = hull._leftmost(xs, ys)
+    order = hull.angular_order(xs, ys, xs[pivot], ys[pivot], 0, -1)
+    order = order[(xs[order] != xs[pivot]) | (ys[order] != ys[pivot])]
+
+    x, y = xs.tolist(), ys.tolist()
+    chain = [pivot]
+    trace.push(ids[pivot])
+    for i in order.tolist():
+        _scan(trace, x, y, ids, chain, i)
+        chain.append(i)
+        trace.push(ids[i])
+
+def _jarvis(xs, ys, ids, trace:Trace) -> None:
+    # Plain gift wrapping, a test for every improvement of the candidate
+    x, y = xs.tolist(), ys.tolist()
+    n = len(x)
+    start = hull._leftmost(xs, ys)
+    current = start
+    trace.push(ids[start])
+    for _ in range(n):
+        best = None
+        for j in range(n):
+            if x[j] == x[current] and y[j] == y[current]: continue
+            if best is not None:
+                turn = cross(x[current], y[current], x[best], y[best], x[j], y[j])
+                if turn < 0 or (turn == 0 and hull._dist(x, y, current, j) <= hull._dist(x, y, current, best)):
+                    continue
+            best = j
+            trace.test(ids[current], ids[j])
+        if best is None or (x[best] == x[start] and y[best] == y[start]): break
+        trace.push(ids[best])
+        current = best
+
+def _monotone(xs, ys, ids, trace:Trace) -> None:
+    # Upper chain left to right, then the lower chain back on the same
+    # stack, never popping below the rightmost point
+    order = np.lexsort((-ys, xs)).tolist()
+    x, y = xs.tolist(), ys.tolist()
+    chain = []
+    for i in order:
+        trace.sweep(x[i])
+        _scan(trace, x, y, ids, chain, i)
+        chain.append(i)
+        trace.push(ids[i])
+    base = len(chain) - 1
+    for i in order[-2::-1]:
+        trace.sweep(x[i])
+        _scan(trace, x, y, ids, chain, i, base)
+        if i == order[0]: break
+        chain.append(i)
+        trace.push(ids[i])
+
+TRACERS = {
+    "graham": _graham,
+    "jarvis": _jarvis,
+    "monotone": _monotone,
+}
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4):
+        sys.exit(f"Usage: python {sys.argv[0]} <points file> <trace file> [{'|'.join(TRACERS)}]")
+    import point_io
+    xs, ys, _ = point_io.load_points(sys.argv[1])
+    record(np.column_stack((xs, ys)), sys.argv[3] if len(sys.argv) == 4 else "graham").write(sys.argv[2])
@@ -0,0 +1,125 @@
+import bisect
+import numpy as np
+
+import hull
+import predicates
+
+# Online convex hull for point streams.
+# The hull is kept as the same upper and lower chains hull.monotone_chain
+# builds, each a list sorted by x. Locating a new point is a binary search,
+# a point under the upper chain and above the lower chain is rejected after
+# two orientation tests, and only the vertices a new point hides are removed.
+
+class _Chain:
+    # Upper chain, sorted by (x, -y) and turning clockwise. The lower chain is
+    # the upper chain of the points rotated by 180 degrees, so it reuses the
+    # same logic with sign = -1.
+    sign: int
+    keys: list
+    xs: list
+    ys: list
+
+    def __init__(self, sign:int) -> None:
+        self.sign = sign
+        self.keys = []
+        self.xs = []
+        self.ys = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def contains(self, x, y) -> bool:
+        x, y = self.sign * x, self.sign * y
+        i = bisect.bisect_left(self.keys, (x, -y))
+        if i < len(self.keys) and self.keys[i] == (x, -y):
+            return True
+        if i == 0 or i == len(self.keys):
+            return False
+        return predicates.cross(self.xs[i - 1], self.ys[i - 1], self.xs[i], self.ys[i], x, y) <= 0
+
+    def add(self, x, y) -> bool:
+        if self.contains(x, y):
+            return False
+        x, y = self.sign * x, self.sign * y
+        i = bisect.bisect_left(self.keys, (x, -y))
+        self.keys.insert(i, (x, -y))
+        self.xs.insert(i, x)
+        self.ys.insert(i, y)
+
+        # Remove the neighbours that are no longer clockwise turns
+        while i >= 2 and predicates.cross(self.xs[i - 2], self.ys[i - 2], self.xs[i - 1], self.ys[i - 1], x, y) >= 0:
+            self._remove(i - 1)
+            i -= 1
+        while i + 2 < len(self.keys) and predicates.cross(x, y, self.xs[i + 1], self.ys[i + 1], self.xs[i + 2], self.ys[i + 2]) >= 0:
+            self._remove(i + 1)
+        return True
+
+    def _remove(self, i:int) -> None:
+        del self.keys[i]
+        del self.xs[i]
+        del self.ys[i]
+
+    def vertices(self) -> list:
+        return [(self.sign * x, self.sign * y) for x, y in zip(self.xs, self.ys)]
+
+class IncrementalHull:
+    upper: _Chain
+    lower: _Chain
+    count: int
+
+    def __init__(self, points=None) -> None:
+        self.upper = _Chain(1)
+        self.lower = _Chain(-1)
+        self.count = 0
+        if points is not None:
+            self.add_many(points)
+
+    def __len__(self) -> int:
+        return len(self.vertices())
+
+    def __contains__(self, point) -> bool:
+        x, y = point[0], point[1]
+        return self.upper.contains(x, y) and self.lower.contains(x, y)
+
+    def add(self, point) -> bool:
+        # Returns whether the hull changed
+        x, y = _scalar(point[0]), _scalar(point[1])
+        self.count += 1
+        changed_upper = self.upper.add(x, y)
+        changed_lower = self.lower.add(x, y)
+        return changed_upper or changed_lower
+
+    def add_many(self, points) -> bool:
+        xs, ys = hull.as_xy(points)
+        if len(xs) == 0:
+            return False
+        if len(xs) <= len(self.upper) + len(self.lower):
+            changed = False
+            for x, y in zip(xs.tolist(), ys.tolist()):
+                changed = self.add((x, y)) or changed
+            return changed
+
+        # A large batch is cheaper to merge by rebuilding from the current
+        # vertices plus the batch than by inserting point by point
+        current = self.vertices()
+        candidates = np.column_stack((xs, ys))
+        if len(current) > 0:
+            candidates = np.concatenate((current, candidates))
+        indices = hull.convex_hull(candidates, "monotone", cull=True)
+        self.upper = _Chain(1)
+        self.lower = _Chain(-1)
+        for x, y in candidates[indices].tolist():
+            self.upper.add(x, y)
+            self.lower.add(x, y)
+        self.count += len(xs)
+        return len(indices) != len(current) or not np.array_equal(candidates[indices], current)
+
+    def vertices(self) -> np.ndarray:
+        # Clockwise from the leftmost point, like the engines in hull.py
+        upper, lower = self.upper.vertices(), self.lower.vertices()
+        if len(upper) <= 1:
+            return np.array(upper).reshape(-1, 2)
+        return np.array(upper[:-1] + lower[:-1]).reshape(-1, 2)
+
+def _scalar(value):
+    return value.item() if hasattr(value, "item") else value
@@ -1,98 +1,97 @@
-from manim import *
 import math
-import random
-import importlib
+import functools
 import operator as op
-
-geo = importlib.import_module("geometry")
-mPoint = geo.mPoint
-mLine = geo.mLine
+from typing import List
+import numpy as np
+from manim import BLUE, RED, Dot, FadeIn, FadeOut, LaggedStart, Scene, Transform, Uncreate, Write, color_gradient
+
+from geometry import mLine, mPoint
+import hull
+from pointset import PointSet
+from profiling import InstrumentedScene
+import rendering
+CompactScene = rendering.CompactScene
+LevelOfDetailScene = rendering.LevelOfDetailScene
+ReplayScene = rendering.ReplayScene
+import point_io
+import scene_settings
+import point_gen
 
 points_file = "points" # Leave empty for randomized points
 
 rdn = False
 seed = 3
 num_rand_points = 10
+distribution = "uniform" # Grid cells for randomized points: "uniform", "disk", "circle" or "gaussian"
 
 wait = True
 animation_speed = 1
+cull = False # Drop points inside the Akl-Toussaint polygon before running the algorithm
+compact = False # Render each algorithm step as a single play call
+lod_threshold = 500 # Above this many points, draw non-hull points as one point cloud
+lod_rays = 64 # Rays drawn per fan-out above lod_threshold
+replay = "" # "graham", "jarvis" or "monotone" to replay a headless trace of that algorithm instead of the steps below
+trace_file = "" # With replay, read the trace from here if it exists, otherwise write it here
+cache = False # Keep computed hulls and traces in the on-disk cache of hull_cache.py
+engine = "march" # "march" animates every fan-out, "monotone" or "chan" compute the hull up front
+
+profile = False # Print time and allocations per algorithm phase and per play call
+profile_trace = "" # Filename for a Chrome trace of the same, empty for none
 
-class JarvisMarch(Scene):
+scene_settings.apply(globals()) # Overrides from render_batch.py, if any
+
+class JarvisMarch(CompactScene, LevelOfDetailScene, ReplayScene, InstrumentedScene, Scene):
     def construct(self):
-        if points_file != "":
-            points, min_x, max_x, min_y, max_y = self.load_points(points_file)
-            axes_x_min, axes_x_max = min_x - 1, max_x + 1
-            axes_y_min, axes_y_max = min_y - 1, max_y + 1
-        else:
-            if rdn: random.seed()
-            else: random.seed(a=seed)
-            axes_x_min, axes_x_max = 0, 20
-            axes_y_min, axes_y_max = 0, 20
-            points = self.randomize_points(axes_x_min, axes_x_max, axes_y_min, axes_y_max, num_rand_points)
-
-        axes = Axes(
-                x_range=(axes_x_min, axes_x_max),
-                y_range=(axes_y_min, axes_y_max),
-                x_length=10,
-                y_length=6,
-                axis_config={
-                    "stroke_color": GREY_A,
-                    "stroke_width": 2,
-                    },
-                )
-        points = [mPoint(x, y, axes) for (x, y) in points]
+        with self.phase("load points"):
+            if points_file != "":
+                points, min_x, max_x, min_y, max_y = self.load_points(points_file)
+                axes_x_min, axes_x_max = min_x - 1, max_x + 1
+                axes_y_min, axes_y_max = min_y - 1, max_y + 1
+            else:
+                axes_x_min, axes_x_max = 0, 20
+                axes_y_min, axes_y_max = 0, 20
+                points = self.randomize_points(axes_x_min, axes_x_max, axes_y_min, axes_y_max, num_rand_points)
+
+        with self.phase("axes"):
+            axes = rendering.axes((axes_x_min, axes_x_max), (axes_y_min, axes_y_max))
+        with self.phase("mobjects"):
+            point_set = PointSet.from_pairs(points, axes)
+            points = point_set.mpoints()
 
         self.play(Write(axes), run_time=animation_speed)
 
         self.play(
-                LaggedStart(
-                    *[Write(p.point) for p in points],
-                    lag_ratio=1 / len(points)
-                    )
+                self.introduce_points(point_set, axes)
                 )
 
-        x_min, x_max = None, None
-        for point in points:
-            if x_min is None or x_max is None:
-                x_min = point
-                x_max = point
-                continue
-            if x_min.x == point.x and x_min.y < point.y:
-                x_min = point
-            if x_min.x > point.x:
-                x_min = point
-            if x_max.x == point.x and x_max.y > point.y:
-                x_max = point
-            if x_max.x < point.x:
-                x_max = point
+        with self.phase("degeneracy"):
+            degenerate = hull.is_degenerate(point_set)
+        if degenerate:
+            self.play_degenerate(point_set, axes)
+            return
+
+        if cull:
+            with self.phase("cull"):
+                points = self.cull_points(point_set, points)
+
+        if replay != "":
+            with self.phase("trace"):
+                trace = self.algorithm_trace(point_set, replay)
+            self.play_trace(trace, point_set, axes)
+            return
+
+        with self.phase("extreme point"):
+            x_min = point_set.mpoint(point_set.leftmost())
+            x_max = point_set.mpoint(point_set.rightmost())
 
         hull_points = [x_min]
         hull_lines = []
-        min_dot = Dot(color=BLUE).move_to(axes.c2p(x_min.x, x_min.y))
-        min_label = Tex(fr"min=({x_min.x}, {x_min.y})", color=WHITE)
-        min_label.next_to(x_min.point, UP)
-        label_box = Rectangle(
-                width=min_label.width + 0.25,
-                height=min_label.height + 0.25,
-                color=WHITE,
-                fill_color=WHITE,
-                fill_opacity=0.1
-                )
-        label_box.next_to(min_label, ORIGIN)
-        min_label = VGroup(min_label, label_box)
-
-        max_dot = Dot(color=BLUE).move_to(axes.c2p(x_max.x, x_max.y))
-        max_label = Tex(fr"max=({x_max.x}, {x_max.y})", color=WHITE)
-        max_label.next_to(x_max.point, UP)
-        label_box = Rectangle(
-                width=max_label.width + 0.25,
-                height=max_label.height + 0.25,
-                color=WHITE,
-                fill_color=WHITE,
-                fill_opacity=0.1
-                )
-        label_box.next_to(max_label, ORIGIN)
-        max_label = VGroup(max_label, label_box)
+        with self.phase("labels"):
+            min_dot = Dot(color=BLUE).move_to(axes.c2p(x_min.x, x_min.y))
+            min_label = rendering.label(fr"min=({x_min.x}, {x_min.y})", x_min.point)
+
+            max_dot = Dot(color=BLUE).move_to(axes.c2p(x_max.x, x_max.y))
+            max_label = rendering.label(fr"max=({x_max.x}, {x_max.y})", x_max.point)
         self.play(
                 Transform(x_min.point, min_dot),
                 Transform(x_max.point, max_dot),
@@ -107,58 +106,25 @@ class JarvisMarch(Scene):
                 run_time=animation_speed
                 )
 
+        if engine != "march":
+            self.play_hull_chains(axes, point_set, axes_y_min, axes_y_max)
+            return
+
         sweep_bot = mPoint(x_min.x, axes_x_min, axes)
         sweep_top = mPoint(x_min.x, axes_y_max, axes)
         prev_sweep_line = mLine(sweep_bot, sweep_top)
         self.play(Write(prev_sweep_line.line), run_time=animation_speed)
 
-        lines = self.construct_lines_from_point(x_min, op.ge, points)
-        max_slope = self.get_max_slope(lines)
-        hull_points.append(max_slope.end)
-        hull_lines.append(max_slope)
-
-        self.play(
-                LaggedStart(
-                    *[Write(l.line) for l in lines],
-                    lag_ratio=0.25
-                    ),
-                run_time=animation_speed
-                )
-
-        if wait: self.wait()
-        self.play(
-                LaggedStart(
-                    *[Uncreate(l.line) for l in lines if l not in hull_lines],
-                    lag_ratio=0.25
-                    ),
-                run_time=animation_speed
-                )
-        new_hull_point = Dot(color=BLUE).move_to(axes.c2p(max_slope.end.x, max_slope.end.y))
-        self.play(Transform(max_slope.end.point, new_hull_point), run_time=animation_speed)
-
-        sweep_bot.move_to(axes.c2p(hull_points[-1].x, axes_y_min))
-        sweep_top.move_to(axes.c2p(hull_points[-1].x, axes_y_max))
-        sweep_line = mLine(sweep_bot, sweep_top)
-        self.play(Transform(prev_sweep_line.line, sweep_line.line), run_time=animation_speed)
-
-        previous = None
-        considering = hull_points[-1]
-        while considering is not x_max:
-            print(f'UPPER HULL CONSIDERING ({considering.x}, {considering.y})')
-            del lines
-            del max_slope
-            lines = self.construct_lines_from_point(considering, op.ge, [p for p in points if p is not previous])
+        with self.phase("fan-out"):
+            lines = self.construct_lines_from_point(x_min, op.ge, points)
             max_slope = self.get_max_slope(lines)
             hull_points.append(max_slope.end)
             hull_lines.append(max_slope)
-            right_lines = [l for l in lines if l.end.x >= considering.x]
-            for l in right_lines:
-                if max_slope.start is l.start and max_slope.end is l.end:
-                    l.line.set_color(BLUE)
 
+        with self.step():
             self.play(
                     LaggedStart(
-                        *[Write(l.line) for l in right_lines],
+                        *[Write(l.line) for l in self.visible_lines(lines, hull_lines)],
                         lag_ratio=0.25
                         ),
                     run_time=animation_speed
@@ -167,99 +133,149 @@ class JarvisMarch(Scene):
             if wait: self.wait()
             self.play(
                     LaggedStart(
-                        *[Uncreate(l.line) for l in right_lines if l not in hull_lines],
+                        *[Uncreate(l.line) for l in self.visible_lines(lines, hull_lines) if l not in hull_lines],
                         lag_ratio=0.25
                         ),
                     run_time=animation_speed
                     )
-            previous = considering
-            considering = hull_points[-1]
-            new_hull_point = Dot(color=BLUE).move_to(axes.c2p(considering.x, considering.y))
-            self.play(Transform(considering.point, new_hull_point), run_time=animation_speed)
+            new_hull_point = Dot(color=BLUE).move_to(axes.c2p(max_slope.end.x, max_slope.end.y))
+            self.play(Transform(max_slope.end.point, new_hull_point), run_time=animation_speed)
 
             sweep_bot.move_to(axes.c2p(hull_points[-1].x, axes_y_min))
             sweep_top.move_to(axes.c2p(hull_points[-1].x, axes_y_max))
             sweep_line = mLine(sweep_bot, sweep_top)
             self.play(Transform(prev_sweep_line.line, sweep_line.line), run_time=animation_speed)
 
-        while considering is not x_min:
-            print(f'LOWER HULL CONSIDERING ({considering.x}, {considering.y})')
-            del lines
-            del max_slope
-            lines = self.construct_lines_from_point(considering, op.le, [p for p in points if p is not previous])
-            for l in lines:
-                if l.slope == 999999: l.slope = -999999
-            max_slope = self.get_max_slope(lines)
-            hull_points.append(max_slope.end)
-            hull_lines.append(max_slope)
-            left_lines = [l for l in lines if l.end.x <= considering.x]
-            for l in left_lines:
-                if max_slope.start is l.start and max_slope.end is l.end:
-                    l.line.set_color(BLUE)
-            self.play(
-                    LaggedStart(
-                        *[Write(l.line) for l in left_lines],
-                        lag_ratio=0.25
-                        ),
-                    run_time=animation_speed
-                    )
+        previous = None
+        considering = hull_points[-1]
+        while considering is not x_max:
+            with self.step():
+                print(f'UPPER HULL CONSIDERING ({considering.x}, {considering.y})')
+                del lines
+                del max_slope
+                with self.phase("fan-out"):
+                    lines = self.construct_lines_from_point(considering, op.ge, [p for p in points if p is not previous])
+                    max_slope = self.get_max_slope(lines)
+                    hull_points.append(max_slope.end)
+                    hull_lines.append(max_slope)
+                    right_lines = [l for l in lines if l.end.x >= considering.x]
+                    for l in right_lines:
+                        if max_slope.start is l.start and max_slope.end is l.end:
+                            l.set_color(BLUE)
+
+                self.play(
+                        LaggedStart(
+                            *[Write(l.line) for l in self.visible_lines(right_lines, hull_lines)],
+                            lag_ratio=0.25
+                            ),
+                        run_time=animation_speed
+                        )
+
+                if wait: self.wait()
+                self.play(
+                        LaggedStart(
+                            *[Uncreate(l.line) for l in self.visible_lines(right_lines, hull_lines) if l not in hull_lines],
+                            lag_ratio=0.25
+                            ),
+                        run_time=animation_speed
+                        )
+                previous = considering
+                considering = hull_points[-1]
+                new_hull_point = Dot(color=BLUE).move_to(axes.c2p(considering.x, considering.y))
+                self.play(Transform(considering.point, new_hull_point), run_time=animation_speed)
+
+                sweep_bot.move_to(axes.c2p(hull_points[-1].x, axes_y_min))
+                sweep_top.move_to(axes.c2p(hull_points[-1].x, axes_y_max))
+                sweep_line = mLine(sweep_bot, sweep_top)
+                self.play(Transform(prev_sweep_line.line, sweep_line.line), run_time=animation_speed)
 
-            if wait: self.wait()
-            self.play(
-                    LaggedStart(
-                        *[Uncreate(l.line) for l in left_lines if l not in hull_lines],
-                        lag_ratio=0.25
-                        ),
-                    run_time=animation_speed
-                    )
-            previous = considering
-            considering = hull_points[-1]
-            new_hull_point = Dot(color=BLUE).move_to(axes.c2p(considering.x, considering.y))
-            self.play(Transform(considering.point, new_hull_point), run_time=animation_speed)
+        while considering is not x_min:
+            with self.step():
+                print(f'LOWER HULL CONSIDERING ({considering.x}, {considering.y})')
+                del lines
+                del max_slope
+                with self.phase("fan-out"):
+                    lines = self.construct_lines_from_point(considering, op.le, [p for p in points if p is not previous])
+                    for l in lines:
+                        if l.slope == math.inf: l.set_slope(-math.inf)
+                    max_slope = self.get_max_slope(lines)
+                    hull_points.append(max_slope.end)
+                    hull_lines.append(max_slope)
+                    left_lines = [l for l in lines if l.end.x <= considering.x]
+                    for l in left_lines:
+                        if max_slope.start is l.start and max_slope.end is l.end:
+                            l.set_color(BLUE)
+                self.play(
+                        LaggedStart(
+                            *[Write(l.line) for l in self.visible_lines(left_lines, hull_lines)],
+                            lag_ratio=0.25
+                            ),
+                        run_time=animation_speed
+                        )
+
+                if wait: self.wait()
+                self.play(
+                        LaggedStart(
+                            *[Uncreate(l.line) for l in self.visible_lines(left_lines, hull_lines) if l not in hull_lines],
+                            lag_ratio=0.25
+                            ),
+                        run_time=animation_speed
+                        )
+                previous = considering
+                considering = hull_points[-1]
+                new_hull_point = Dot(color=BLUE).move_to(axes.c2p(considering.x, considering.y))
+                self.play(Transform(considering.point, new_hull_point), run_time=animation_speed)
+
+                sweep_bot.move_to(axes.c2p(hull_points[-1].x, axes_x_min))
+                sweep_top.move_to(axes.c2p(hull_points[-1].x, axes_x_max))
+                sweep_line = mLine(sweep_bot, sweep_top)
+                self.play(Transform(prev_sweep_line.line, sweep_line.line), run_time=animation_speed)
 
-            sweep_bot.move_to(axes.c2p(hull_points[-1].x, axes_x_min))
-            sweep_top.move_to(axes.c2p(hull_points[-1].x, axes_x_max))
-            sweep_line = mLine(sweep_bot, sweep_top)
-            self.play(Transform(prev_sweep_line.line, sweep_line.line), run_time=animation_speed)
-        
         self.play(Uncreate(prev_sweep_line.line), run_time=animation_speed)
 
+    def play_hull_chains(self, axes, point_set, y_min, y_max) -> None:
+        # The hull comes from a headless engine, so only the upper (op.ge)
+        # and lower (op.le) passes are drawn, one hull edge at a time.
+        with self.phase("hull engine"):
+            upper, lower = hull.split_chains(point_set, self.hull_indices(point_set, engine))
+        start = point_set.mpoint(upper[0])
+        sweep_line = mLine(mPoint(start.x, y_min, axes), mPoint(start.x, y_max, axes))
+        self.play(Write(sweep_line.line), run_time=animation_speed)
+        for chain in (upper, lower):
+            for a, b in zip(chain[:-1], chain[1:]):
+                edge = mLine(point_set.mpoint(a), point_set.mpoint(b)).set_color(BLUE)
+                end = edge.end
+                new_sweep_line = mLine(mPoint(end.x, y_min, axes), mPoint(end.x, y_max, axes))
+                self.play(
+                        Write(edge.line),
+                        Transform(end.point, Dot(color=BLUE).move_to(axes.c2p(end.x, end.y))),
+                        Transform(sweep_line.line, new_sweep_line.line),
+                        run_time=animation_speed
+                        )
+        self.play(Uncreate(sweep_line.line), run_time=animation_speed)
+
+    def cull_points(self, point_set, points:List[mPoint]) -> List[mPoint]:
+        # Fade out every point strictly inside the polygon of extreme points
+        keep = hull.cull_interior(point_set)
+        if self.lod:
+            self.play(self.shrink_cloud(point_set, point_set.axes, keep), run_time=animation_speed)
+            return [points[i] for i in keep]
+        keep = set(keep.tolist())
+        culled = [p for i, p in enumerate(points) if i not in keep]
+        if len(culled) > 0:
+            self.play(*[FadeOut(p.point) for p in culled], run_time=animation_speed)
+        return [p for i, p in enumerate(points) if i in keep]
+
     def get_bounds(self, points):
-        x_min = None
-        x_max = None
-        y_min = None
-        y_max = None
-        for point in points:
-            x, y = point[0], point[1]
-            if x_min is None:
-                x_min = x
-                x_max = x
-            if y_min is None:
-                y_min = y
-                y_max = y
-            if x_min > x: x_min = x
-            if x_max < x: x_max = x
-            if y_min > y: y_min = y
-            if y_max < y: y_max = y
-        return x_min, x_max, y_min, y_max
+        return PointSet.from_pairs(points).bounds()
 
     def parse_args(self, axes, pairs):
-        points = {}
-        for pair in pairs:
-            x, y = [int(z) for z in pair.split(',')]
-            coords = f"{x}-{y}"
-            if coords in points: continue
-            points[coords] = mPoint(x, y, axes)
-        return list(points.values())
-
-    def randomize_points(self, min_x:int, max_x:int, min_y:int, max_y:int, num:int) -> List[mPoint]:
-        points = {}
-        while len(points) < num:
-            (x, y) = random.randint(min_x + 1, max_x - 1), random.randint(min_y + 1, max_y - 1)
-            coords = f"{x}-{y}"
-            if coords in points: continue
-            points[coords] = (x, y)
-        return list(points.values())
+        coords = np.array([[int(z) for z in pair.split(',')] for pair in pairs], dtype=np.int64).reshape(-1, 2)
+        xs, ys, _ = point_io.unique_points(coords[:, 0], coords[:, 1])
+        return [mPoint(x, y, axes) for x, y in zip(xs.tolist(), ys.tolist())]
+
+    def randomize_points(self, min_x:int, max_x:int, min_y:int, max_y:int, num:int) -> np.ndarray:
+        return point_gen.grid_points(num, min_x, max_x, min_y, max_y, distribution, None if rdn else seed)
 
     def construct_lines_from_point(self, origin:mPoint, relate:op, points:List[mPoint]) -> List[mLine]:
         lines = []
@@ -271,7 +287,7 @@ class JarvisMarch(Scene):
                 # slope = dy/dx
                 if dx == 0:
                     # Handle vertical slopes    
-                    slope = 999999 if dy > 0 else -999999
+                    slope = math.inf if dy > 0 else -math.inf
                 else:
                     slope = dy / dx
                 # magnitude = sqrt(dx^2 + dy^2)
@@ -282,10 +298,10 @@ class JarvisMarch(Scene):
                 lines.append(line)
             else: continue
 
-        lines = sorted(lines, key=lambda l: l.get_slope())
+        lines = sorted(lines, key=functools.cmp_to_key(mLine.compare_slope))
         line_colors = color_gradient([RED, BLUE], len(lines))
         for i, line in enumerate(lines):
-            line.line.set_color(line_colors[i])
+            line.set_color(line_colors[i])
 
         return lines
 
@@ -295,24 +311,21 @@ class JarvisMarch(Scene):
             if max_slope is None:
                 max_slope = line
                 continue
-            if max_slope.get_slope() < line.get_slope():
+            # Exact comparisons, rounded slopes can tie or invert
+            slope = line.compare_slope(max_slope)
+            if slope > 0:
                 max_slope = line
                 continue
 
             # Case for co-linearity, we would pick the slope with largest magnitude.
-            if max_slope.get_slope() == line.get_slope() and max_slope.get_mag() < line.get_mag():
+            if slope == 0 and line.compare_length(max_slope) > 0:
                 max_slope = line
                 continue
 
         return max_slope
 
     def load_points(self, filename:str):
-        points = []
-        with open(filename) as f:
-            raw = f.readlines()
-            for line in raw:
-                if line == "": continue
-                [x, y] = line.split(" ")
-                points.append((int(x), int(y)))
-        min_x, max_x, min_y, max_y = self.get_bounds(points)
+        # Repeated points would be collinear with every line through them
+        xs, ys, (min_x, max_x, min_y, max_y) = point_io.load_points(filename, unique=True)
+        points = np.column_stack((xs, ys))
         return points, min_x, max_x, min_y, max_y
\ No newline at end of file
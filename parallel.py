@@ -0,0 +1,53 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+import hull
+
+# Multi-process hull for large inputs.
+# The coordinates are copied once into shared memory, every worker computes
+# the hull of one contiguous index range of it, and the final hull is taken
+# over the union of the sub-hull vertices. Workers only receive the shared
+# memory name and their index range, so no points are pickled.
+
+min_chunk = 1 << 16
+
+def parallel_hull(points, workers:int=None, engine:str="monotone") -> np.ndarray:
+    xs, ys = hull.as_xy(points)
+    n = len(xs)
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, max(1, n // min_chunk))
+    if workers == 1:
+        return hull.convex_hull(points, engine, cull=True)
+
+    dtype = np.result_type(xs, ys)
+    shm = shared_memory.SharedMemory(create=True, size=2 * n * dtype.itemsize)
+    try:
+        shared = np.ndarray((2, n), dtype=dtype, buffer=shm.buf)
+        shared[0], shared[1] = xs, ys
+        del shared
+
+        bounds = np.linspace(0, n, workers + 1).astype(np.int64)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_chunk_hull, shm.name, n, dtype.str, int(lo), int(hi), engine)
+                for lo, hi in zip(bounds[:-1], bounds[1:])
+            ]
+            candidates = np.concatenate([f.result() for f in futures])
+    finally:
+        shm.close()
+        shm.unlink()
+
+    merged = np.column_stack((xs[candidates], ys[candidates]))
+    return candidates[hull.convex_hull(merged, engine, cull=True)]
+
+def _chunk_hull(name:str, n:int, dtype:str, lo:int, hi:int, engine:str) -> np.ndarray:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        shared = np.ndarray((2, n), dtype=np.dtype(dtype), buffer=shm.buf)
+        chunk = np.column_stack((shared[0, lo:hi], shared[1, lo:hi]))
+        del shared
+        return lo + hull.convex_hull(chunk, engine, cull=True)
+    finally:
+        shm.close()
@@ -0,0 +1,154 @@
+import sys
+import numpy as np
+
+# Seeded random point generation without manim.
+# Points are distinct integer grid cells strictly inside the given bounds,
+# the same cells the scenes' randomize_points used to draw one at a time.
+# Cells are numbered row by row within the region of the distribution and
+# sampled without replacement as whole arrays, so asking for more points
+# than the region holds fails at once instead of retrying forever.
+#   uniform   every cell inside the bounds
+#   disk      cells within the largest centred circle
+#   circle    cells on the rim of that circle, one cell wide
+#   gaussian  cells around the centre, normally distributed with a sixth of
+#             the smaller extent as standard deviation
+# grid_points_3d draws uniform cells of a cube the same way.
+#
+# Usage:
+#   python point_gen.py <count> <distribution> [seed] > points
+
+DISTRIBUTIONS = ("uniform", "disk", "circle", "gaussian")
+
+def grid_points(num:int, min_x:int, max_x:int, min_y:int, max_y:int, distribution:str="uniform", seed=None) -> np.ndarray:
+    # (num, 2) int64 array of distinct cells, reproducible for a given seed
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution {distribution!r}, expected one of {', '.join(DISTRIBUTIONS)}")
+    rng = np.random.default_rng(seed)
+    x0, y0 = min_x + 1, min_y + 1
+    width, height = max(max_x - x0, 0), max(max_y - y0, 0)
+    if distribution == "uniform":
+        cells = sample_cells(rng, width * height, num)
+        points = np.empty((len(cells), 2), dtype=np.int64)
+        np.divmod(cells, max(width, 1), out=(points[:, 1], points[:, 0]))
+        points += (x0, y0)
+        return points
+
+    cx, cy = x0 + (width - 1) // 2, y0 + (height - 1) // 2
+    radius = (min(width, height) - 1) // 2
+    if distribution == "gaussian":
+        dx, dy = _gaussian_offsets(rng, num, width, height, cx - x0, cy - y0)
+    else:
+        dx, dy = _ring_offsets(rng, num, radius, radius - 1 if distribution == "circle" else -1)
+    return np.column_stack((cx + dx, cy + dy))
+
+def grid_points_3d(num:int, low:int, high:int, seed=None) -> np.ndarray:
+    # (num, 3) int64 array of distinct uniform cells strictly inside the cube
+    # low..high on every axis
+    rng = np.random.default_rng(seed)
+    side = max(high - low - 1, 0)
+    cells = sample_cells(rng, side ** 3, num)
+    points = np.empty((len(cells), 3), dtype=np.int64)
+    rows, points[:, 0] = np.divmod(cells, max(side, 1))
+    np.divmod(rows, max(side, 1), out=(points[:, 2], points[:, 1]))
+    points += low + 1
+    return points
+
+def sample_cells(rng, total:int, num:int) -> np.ndarray:
+    # num distinct integers in [0, total), in random order
+    if num > total:
+        raise ValueError(f"Cannot place {num} distinct points on {total} grid cells")
+    if 2 * num >= total:
+        return rng.permutation(total)[:num]
+    # Sparse: draw with replacement and drop repeats, which are rare
+    cells = _sorted_unique(rng.integers(0, total, num + num // 8 + 16))
+    while len(cells) < num:
+        need = num - len(cells)
+        cells = _sorted_unique(np.concatenate((cells, rng.integers(0, total, need + need // 8 + 16))))
+    rng.shuffle(cells)
+    return cells[:num]
+
+def _sorted_unique(values:np.ndarray) -> np.ndarray:
+    # In place, values is sorted
+    values.sort()
+    keep = np.ones(len(values), dtype=bool)
+    keep[1:] = values[1:] != values[:-1]
+    return values[keep]
+
+def _isqrt(values:np.ndarray) -> np.ndarray:
+    # Integer square roots, the float estimate is off by at most one
+    roots = np.floor(np.sqrt(values.astype(np.float64))).astype(np.int64)
+    roots -= roots * roots > values
+    roots += (roots + 1) * (roots + 1) <= values
+    return roots
+
+def _ring_offsets(rng, num:int, outer:int, inner:int):
+    # Offsets with inner^2 < dx^2 + dy^2 <= outer^2 (inner < 0 for a disk).
+    # Each row dy holds the cells inner_w < |dx| <= outer_w.
+    if outer < 0:
+        raise ValueError(f"Cannot place {num} distinct points on 0 grid cells")
+    dy = np.arange(-outer, outer + 1, dtype=np.int64)
+    outer_w = _isqrt(outer * outer - dy * dy)
+    inner_w = np.full(len(dy), -1, dtype=np.int64)
+    if inner >= 0:
+        inside = dy * dy <= inner * inner
+        inner_w[inside] = _isqrt(inner * inner - dy[inside] * dy[inside])
+    counts = 2 * outer_w + 1 - np.where(inner_w >= 0, 2 * inner_w + 1, 0)
+    starts = np.concatenate(([0], np.cumsum(counts)))
+
+    cells = sample_cells(rng, int(starts[-1]), num)
+    row = np.searchsorted(starts, cells, side="right") - 1
+    k = cells - starts[row]
+    wo, wi = outer_w[row], inner_w[row]
+    # Rows with a hole: left run -wo..-wi-1, then right run wi+1..wo
+    left = np.maximum(wo - wi, 0)
+    dx = np.where((wi < 0) | (k < left), k - wo, wi + 1 + k - left)
+    return dx, dy[row]
+
+def _gaussian_offsets(rng, num:int, width:int, height:int, cx:int, cy:int):
+    total = width * height
+    if num > total:
+        raise ValueError(f"Cannot place {num} distinct points on {total} grid cells")
+    sigma = max(min(width, height), 1) / 6
+    # Draws stay within a few sigma of the centre, which on an elongated
+    # grid is far fewer cells than width * height
+    reach = int(np.ceil(6 * sigma))
+    x0, x1, y0, y1 = _window(reach, width, height, cx, cy)
+    if 8 * num >= (x1 - x0) * (y1 - y0):
+        # Dense: weighted sampling without replacement over the cells around
+        # the centre, the num smallest exponential keys scaled by the cells'
+        # weights. The window grows until it holds num cells.
+        while (x1 - x0) * (y1 - y0) < num:
+            reach *= 2
+            x0, x1, y0, y1 = _window(reach, width, height, cx, cy)
+        w = x1 - x0
+        cells = np.arange(w * (y1 - y0), dtype=np.int64)
+        dx, dy = cells % w + x0 - cx, cells // w + y0 - cy
+        keys = np.log(rng.exponential(size=len(cells))) + (dx * dx + dy * dy) / (2 * sigma * sigma)
+        pick = np.argpartition(keys, num - 1)[:num] if num > 0 else cells[:0]
+        cells = (dy[pick] + cy) * width + dx[pick] + cx
+    else:
+        # Sparse: rounded normal draws inside the bounds, repeats dropped
+        cells = np.empty(0, dtype=np.int64)
+        while len(cells) < num:
+            need = num - len(cells)
+            draw = np.rint(rng.normal(0, sigma, (2 * need + 16, 2))).astype(np.int64)
+            x, y = draw[:, 0] + cx, draw[:, 1] + cy
+            inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+            cells = _sorted_unique(np.concatenate((cells, y[inside] * width + x[inside])))
+    rng.shuffle(cells)
+    cells = cells[:num]
+    return cells % width - cx, cells // width - cy
+
+def _window(reach:int, width:int, height:int, cx:int, cy:int):
+    # Cells within reach of the centre on both axes, clipped to the grid
+    return max(cx - reach, 0), min(cx + reach + 1, width), max(cy - reach, 0), min(cy + reach + 1, height)
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4) or sys.argv[2] not in DISTRIBUTIONS:
+        sys.exit(f"Usage: python {sys.argv[0]} <count> <{'|'.join(DISTRIBUTIONS)}> [seed]")
+    num = int(sys.argv[1])
+    # A square grid that holds the points comfortably, a circle's rim
+    # only grows with its radius
+    side = (num // 3 if sys.argv[2] == "circle" else int(np.ceil(np.sqrt(4 * num)))) + 4
+    points = grid_points(num, 0, side, 0, side, sys.argv[2], int(sys.argv[3]) if len(sys.argv) == 4 else None)
+    np.savetxt(sys.stdout, points, fmt="%d")
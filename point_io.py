@@ -0,0 +1,210 @@
+import struct
+import sys
+import numpy as np
+
+import hull
+
+# Point file loading without manim.
+# Files are read in fixed-size byte chunks and each chunk is parsed by NumPy
+# in one go, with the bounds gathered in the same pass. stream_hull keeps only
+# the running hull between chunks, so files larger than memory can be reduced
+# in a single pass.
+# Text files hold integers, or any coordinates NumPy parses as floats: a
+# block that is not all integers (or overflows int64) is read as float64.
+# load_points_3d reads the same text format with x y z triples.
+#
+# Besides the whitespace text format there is a binary format that can be
+# memory mapped: a 64 byte header followed by little-endian x, y pairs.
+#   magic        8 bytes  b"HULLPTS\0"
+#   version      uint16
+#   dtype        1 byte   b"i" for int32, b"q" for int64, b"d" for float64
+#   padding      1 byte
+#   count        uint64
+#   bounds       4 x float64 (4 x int64 for b"q"), min_x max_x min_y max_y
+#   padding      12 bytes
+
+chunk_bytes = 1 << 22
+
+BINARY_MAGIC = b"HULLPTS\0"
+BINARY_VERSION = 2
+BINARY_HEADER = struct.Struct("<8sHcxQ4d12x")
+BINARY_HEADER_INT64 = struct.Struct("<8sHcxQ4q12x") # exact bounds for b"q"
+BINARY_DTYPES = {b"i": np.dtype("<i4"), b"q": np.dtype("<i8"), b"d": np.dtype("<f8")}
+
+def is_binary_points(filename:str) -> bool:
+    with open(filename, "rb") as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+def write_binary_points(filename:str, xs, ys) -> None:
+    xs, ys = np.asarray(xs), np.asarray(ys)
+    code = b"i" if xs.dtype.kind in "iu" and ys.dtype.kind in "iu" else b"d"
+    if code == b"i" and len(xs) > 0:
+        info = np.iinfo(np.int32)
+        if min(xs.min(), ys.min()) < info.min or max(xs.max(), ys.max()) > info.max:
+            code = b"q"
+    bounds = _merge_bounds(None, xs, ys) if len(xs) > 0 else (0, 0, 0, 0)
+    if code == b"q":
+        header = BINARY_HEADER_INT64.pack(BINARY_MAGIC, BINARY_VERSION, code, len(xs), *[int(b) for b in bounds])
+    else:
+        header = BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, code, len(xs), *[float(b) for b in bounds])
+    with open(filename, "wb") as f:
+        f.write(header)
+        data = np.empty((len(xs), 2), dtype=BINARY_DTYPES[code])
+        data[:, 0], data[:, 1] = xs, ys
+        data.tofile(f)
+
+def open_binary_points(filename:str):
+    # Zero-copy: the x and y columns are strided views into a read-only memmap
+    with open(filename, "rb") as f:
+        header = f.read(BINARY_HEADER.size)
+    if len(header) < BINARY_HEADER.size:
+        raise ValueError(f"{filename} is too short to be a binary point file")
+    magic, version, code, count, *bounds = BINARY_HEADER.unpack(header)
+    # Version 1 files only differ in storing b"q" bounds as float64
+    if magic != BINARY_MAGIC or version not in (1, BINARY_VERSION) or code not in BINARY_DTYPES:
+        raise ValueError(f"{filename} is not a version {BINARY_VERSION} binary point file")
+    if count == 0:
+        raise ValueError(f"No points found in {filename}")
+    dtype = BINARY_DTYPES[code]
+    data = np.memmap(filename, dtype=dtype, mode="r", offset=BINARY_HEADER.size, shape=(count, 2))
+    if code == b"i":
+        bounds = [int(b) for b in bounds]
+    elif code == b"q" and version == 1:
+        # The float64 header may have rounded them
+        bounds = _merge_bounds(None, data[:, 0], data[:, 1])
+    elif code == b"q":
+        bounds = BINARY_HEADER_INT64.unpack(header)[4:]
+    return data[:, 0], data[:, 1], tuple(bounds)
+
+def iter_point_chunks(filename:str, chunk_size:int=chunk_bytes):
+    if is_binary_points(filename):
+        xs, ys, _ = open_binary_points(filename)
+        step = max(1, chunk_size // (2 * xs.dtype.itemsize))
+        for lo in range(0, len(xs), step):
+            yield np.asarray(xs[lo:lo + step]), np.asarray(ys[lo:lo + step])
+        return
+
+    for chunk in _text_chunks(filename, chunk_size, 2):
+        yield chunk[:, 0], chunk[:, 1]
+
+def _text_chunks(filename:str, chunk_size:int, dims:int):
+    remainder = b""
+    with open(filename, "rb") as f:
+        while True:
+            block = f.read(chunk_size)
+            if not block:
+                break
+            block = remainder + block
+            # Only parse up to the last complete line, carry the rest over
+            end = block.rfind(b"\n") + 1
+            if end == 0:
+                remainder = block
+                continue
+            remainder = block[end:]
+            chunk = _parse_block(block[:end], dims)
+            if len(chunk) > 0:
+                yield chunk
+    chunk = _parse_block(remainder, dims)
+    if len(chunk) > 0:
+        yield chunk
+
+def _parse_block(block:bytes, dims:int=2) -> np.ndarray:
+    words = block.split()
+    try:
+        values = np.array(words, dtype=np.int64)
+    except (ValueError, OverflowError):
+        values = np.array(words, dtype=np.float64)
+    if len(values) % dims != 0:
+        raise ValueError(f"Point file must contain whitespace separated {' '.join('xyz'[:dims])} {'pairs' if dims == 2 else 'triples'}")
+    return values.reshape(-1, dims)
+
+def unique_points(xs, ys):
+    # Drops repeated points, keeping the first copy of each in file order.
+    # Returns the x and y columns and the kept indices. Integer points are
+    # packed into one 64-bit key when their spans allow, so a single sort
+    # finds the repeats.
+    xs, ys = np.asarray(xs), np.asarray(ys)
+    if len(xs) < 2:
+        return xs, ys, np.arange(len(xs))
+    if xs.dtype.kind in "iu" and ys.dtype.kind in "iu":
+        min_x, min_y = int(xs.min()), int(ys.min())
+        span_x, span_y = int(xs.max()) - min_x, int(ys.max()) - min_y
+        if (span_x + 1) * (span_y + 1) <= np.iinfo(np.int64).max:
+            # Cast before subtracting, the differences would wrap in narrower columns
+            keys = (xs.astype(np.int64) - min_x) * (span_y + 1) + (ys.astype(np.int64) - min_y)
+            order = np.argsort(keys)
+            sorted_keys = keys[order]
+            starts = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+            return _first_copies(xs, ys, order, starts)
+    else:
+        # -0.0 and 0.0 are the same point
+        xs, ys = xs + 0.0, ys + 0.0
+    order = np.lexsort((ys, xs))
+    sx, sy = xs[order], ys[order]
+    starts = np.flatnonzero(np.concatenate(([True], (sx[1:] != sx[:-1]) | (sy[1:] != sy[:-1]))))
+    return _first_copies(xs, ys, order, starts)
+
+def _first_copies(xs, ys, order, starts):
+    # The smallest index in each run of equal points
+    keep = np.sort(np.minimum.reduceat(order, starts))
+    return xs[keep], ys[keep], keep
+
+def _merge_bounds(bounds, xs, ys):
+    chunk = (xs.min().item(), xs.max().item(), ys.min().item(), ys.max().item())
+    if bounds is None:
+        return chunk
+    return (
+        min(bounds[0], chunk[0]),
+        max(bounds[1], chunk[1]),
+        min(bounds[2], chunk[2]),
+        max(bounds[3], chunk[3]),
+    )
+
+def load_points(filename:str, chunk_size:int=chunk_bytes, unique:bool=False):
+    # Returns the x and y columns and (min_x, max_x, min_y, max_y).
+    # Binary files are memory mapped and take their bounds from the header.
+    # With unique, repeated points are dropped (see unique_points), which
+    # copies memory mapped columns.
+    if unique:
+        xs, ys, bounds = load_points(filename, chunk_size)
+        xs, ys, _ = unique_points(xs, ys)
+        return xs, ys, bounds
+    if is_binary_points(filename):
+        return open_binary_points(filename)
+    xs, ys, bounds = [], [], None
+    for chunk_xs, chunk_ys in iter_point_chunks(filename, chunk_size):
+        bounds = _merge_bounds(bounds, chunk_xs, chunk_ys)
+        xs.append(chunk_xs)
+        ys.append(chunk_ys)
+    if bounds is None:
+        raise ValueError(f"No points found in {filename}")
+    return np.concatenate(xs), np.concatenate(ys), bounds
+
+def load_points_3d(filename:str, chunk_size:int=chunk_bytes):
+    # Text files of x y z triples, returns the x, y and z columns
+    chunks = list(_text_chunks(filename, chunk_size, 3))
+    if len(chunks) == 0:
+        raise ValueError(f"No points found in {filename}")
+    points = np.concatenate(chunks)
+    return points[:, 0], points[:, 1], points[:, 2]
+
+def stream_hull(filename:str, engine:str="monotone", chunk_size:int=chunk_bytes):
+    # Returns the hull coordinates as an (h, 2) array, the bounds and the
+    # number of points read. Memory stays at one chunk plus the hull.
+    current = np.empty((0, 2), dtype=np.int64)
+    bounds, count = None, 0
+    for chunk_xs, chunk_ys in iter_point_chunks(filename, chunk_size):
+        bounds = _merge_bounds(bounds, chunk_xs, chunk_ys)
+        count += len(chunk_xs)
+        candidates = np.concatenate((current, np.column_stack((chunk_xs, chunk_ys))))
+        current = candidates[hull.convex_hull(candidates, engine, cull=True)]
+    return current, bounds, count
+
+def convert_to_binary(source:str, destination:str) -> None:
+    xs, ys, _ = load_points(source)
+    write_binary_points(destination, xs, ys)
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit(f"Usage: python {sys.argv[0]} <points.txt> <points.bin>")
+    convert_to_binary(sys.argv[1], sys.argv[2])
@@ -0,0 +1,88 @@
+import numpy as np
+
+import geometry
+import hull
+import predicates
+
+# Structure-of-arrays point storage for the algorithm phase.
+# Coordinates live in two contiguous columns (int64 when every coordinate is
+# integral, float64 otherwise), so bounds, extreme points and orientation
+# tests are single array operations. The mPoint objects the scenes animate
+# are only created on request and then cached, keeping their identity stable.
+
+class PointSet:
+    xs: np.ndarray
+    ys: np.ndarray
+    axes: object
+    _mpoints: list
+
+    def __init__(self, xs, ys, axes=None) -> None:
+        xs, ys = np.asarray(xs), np.asarray(ys)
+        if xs.shape != ys.shape or xs.ndim != 1:
+            raise ValueError(f"Coordinate columns must be 1D and equal length, got {xs.shape} and {ys.shape}")
+        dtype = np.int64 if _is_integral(xs) and _is_integral(ys) else np.float64
+        self.xs = np.ascontiguousarray(xs, dtype=dtype)
+        self.ys = np.ascontiguousarray(ys, dtype=dtype)
+        self.axes = axes
+        self._mpoints = [None] * len(self.xs)
+
+    @classmethod
+    def from_pairs(cls, pairs, axes=None) -> "PointSet":
+        xs, ys = hull.as_xy(pairs)
+        return cls(xs, ys, axes)
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def __iter__(self):
+        return zip(self.xs.tolist(), self.ys.tolist())
+
+    def get_coords(self, i:int):
+        return (self.xs[i].item(), self.ys[i].item())
+
+    def to_array(self) -> np.ndarray:
+        return np.column_stack((self.xs, self.ys))
+
+    def set_axes(self, axes) -> "PointSet":
+        self.axes = axes
+        return self
+
+    def mpoint(self, i:int):
+        if self._mpoints[i] is None:
+            x, y = self.get_coords(i)
+            self._mpoints[i] = geometry.mPoint(x, y, self.axes)
+        return self._mpoints[i]
+
+    def mpoints(self) -> list:
+        return [self.mpoint(i) for i in range(len(self))]
+
+    def bounds(self):
+        return hull.bounds(self)
+
+    def leftmost(self) -> int:
+        return hull.leftmost(self)
+
+    def rightmost(self) -> int:
+        return hull.rightmost(self)
+
+    def extremes(self):
+        # Indices of the min x, max x, min y and max y points
+        return (
+            int(np.argmin(self.xs)),
+            int(np.argmax(self.xs)),
+            int(np.argmin(self.ys)),
+            int(np.argmax(self.ys)),
+        )
+
+    def turns(self, origin:int, to:int) -> np.ndarray:
+        # Orientation of every point relative to the line origin -> to
+        ox, oy = self.xs[origin], self.ys[origin]
+        return predicates.cross(ox, oy, self.xs[to], self.ys[to], self.xs, self.ys)
+
+def _is_integral(values:np.ndarray) -> bool:
+    if values.dtype.kind in "iub":
+        return True
+    if values.dtype.kind != "f" or values.size == 0:
+        return values.size == 0
+    # Integral floats beyond 2^62 stay floats, int64 could not hold them
+    return bool(np.all(np.isfinite(values)) and np.all(values == np.round(values)) and np.abs(values).max() < 2.0 ** 62)
@@ -0,0 +1,191 @@
+import math
+import numpy as np
+
+# Exact orientation predicates.
+# These replace the arctan2/rad2deg angle comparisons for turn tests. The
+# results always have the sign of the exact value:
+#   - Python ints are exact already,
+#   - integer arrays of any width are widened to int64 first, and are exact
+#     while every coordinate is within exact_bound, or every difference
+#     within diff_bound,
+#   - beyond that, and for floats, the differences go through an error
+#     bound filter (Shewchuk's orient2d stage A) and only the results too
+#     close to zero to trust are recomputed exactly, on integers scaled by
+#     the floats' common power of two. int64 differences are exact, and
+#     rounding them to floats is the same single rounding the filter
+#     allows for float differences.
+# The magnitudes of filtered results are rounded, only their sign is exact.
+# Nothing here uses Fraction, so the common case stays one pass.
+
+exact_bound = 1 << 30
+diff_bound = 1 << 31
+float_error = 3.3306690738754716e-16
+# orient3d multiplies three coordinates
+exact_bound_3d = 1 << 19
+float_error_3d = 7.771561172376103e-16
+# Differences of int64 coordinates within this bound fit in an int64
+int64_bound = 1 << 62
+
+def cross(ox, oy, ax, ay, bx, by):
+    # > 0 when o -> a -> b turns left, < 0 when it turns right, 0 if collinear
+    return _robust(_cross, _cross_diffs, (ox, oy, ax, ay, bx, by))
+
+def dot(ox, oy, ax, ay, bx, by):
+    # Dot product of o -> a and a -> b, positive when b continues past a
+    return _robust(_dot, _dot_diffs, (ox, oy, ax, ay, bx, by))
+
+def orient3d(ax, ay, az, bx, by, bz, cx, cy, cz, dx, dy, dz):
+    # > 0 when d lies on the side of the plane a, b, c that (b - a) x (c - a)
+    # points to, < 0 on the other side, 0 if the four points are coplanar
+    args = (ax, ay, az, bx, by, bz, cx, cy, cz, dx, dy, dz)
+    if all(type(v) is int for v in args):
+        left, right = _orient3d(*args)
+        return left - right
+
+    arrays = [np.asarray(a) for a in args]
+    if all(a.dtype.kind in "iub" for a in arrays):
+        arrays = [widen(a) for a in arrays]
+        bound = max(_bound(a) for a in arrays)
+        if bound < exact_bound_3d:
+            left, right = _orient3d(*arrays)
+            return left - right
+        if bound >= int64_bound:
+            left, right = _orient3d(*[a.astype(object) for a in arrays])
+            value = np.asarray(left - right).astype(np.float64)
+            return value if value.ndim else value[()]
+        coords = arrays
+    else:
+        coords = [np.asarray(a, dtype=np.float64) for a in arrays]
+
+    # Shewchuk's stage A filter on the differences from a
+    a = coords
+    ux, uy, uz = [np.asarray(v, dtype=np.float64) for v in (a[3] - a[0], a[4] - a[1], a[5] - a[2])]
+    vx, vy, vz = [np.asarray(v, dtype=np.float64) for v in (a[6] - a[0], a[7] - a[1], a[8] - a[2])]
+    wx, wy, wz = [np.asarray(v, dtype=np.float64) for v in (a[9] - a[0], a[10] - a[1], a[11] - a[2])]
+    m1, m2 = vy * wz, vz * wy
+    n1, n2 = vz * wx, vx * wz
+    k1, k2 = vx * wy, vy * wx
+    value = np.asarray(ux * (m1 - m2) + uy * (n1 - n2) + uz * (k1 - k2))
+    bound = np.abs(ux) * (np.abs(m1) + np.abs(m2))
+    bound += np.abs(uy) * (np.abs(n1) + np.abs(n2))
+    bound += np.abs(uz) * (np.abs(k1) + np.abs(k2))
+    bound *= float_error_3d
+    return _settle(_orient3d, value, bound, arrays, 3)
+
+def cross_for(xs, ys):
+    # cross for loops over the same coordinate arrays: when every coordinate
+    # is an int64 within exact_bound the check is done once here and the
+    # bare product is returned instead
+    xs, ys = np.asarray(xs), np.asarray(ys)
+    if xs.dtype == np.int64 and ys.dtype == np.int64 and _bound(xs) < exact_bound and _bound(ys) < exact_bound:
+        return _bare_cross
+    return cross
+
+def widen(a:np.ndarray) -> np.ndarray:
+    # Integer arrays as int64, so that differences and products do not wrap
+    # in a narrower or unsigned dtype. uint64 values past the int64 range
+    # become Python ints.
+    if a.dtype.kind not in "iub" or a.dtype == np.int64:
+        return a
+    if a.dtype == np.uint64 and a.size and a.max() > np.iinfo(np.int64).max:
+        return a.astype(object)
+    return a.astype(np.int64)
+
+def orientation(ox, oy, ax, ay, bx, by) -> int:
+    c = cross(ox, oy, ax, ay, bx, by)
+    return (c > 0) - (c < 0)
+
+def orientations(ox, oy, ax, ay, xs, ys) -> np.ndarray:
+    # Batched orientation of every (xs[i], ys[i]) relative to the line o -> a
+    return np.sign(cross(ox, oy, ax, ay, np.asarray(xs), np.asarray(ys))).astype(np.int8)
+
+def is_left_turn(ax, ay, bx, by, cx, cy) -> bool:
+    # a -> b -> c turns left. Going straight on through b also counts, so
+    # that collinear middle points are dropped from a hull.
+    o = orientation(ax, ay, bx, by, cx, cy)
+    return o > 0 or (o == 0 and dot(ax, ay, bx, by, cx, cy) > 0)
+
+def _bare_cross(ox, oy, ax, ay, bx, by):
+    return (ax - ox) * (by - oy) - (ay - oy) * (bx - ox)
+
+def _bound(a:np.ndarray) -> int:
+    return max(abs(int(a.min())), abs(int(a.max()))) if a.size else 0
+
+# The 2D predicates are p * q - r * s on four coordinate differences
+def _cross_diffs(ox, oy, ax, ay, bx, by):
+    return ax - ox, by - oy, ay - oy, bx - ox
+
+def _dot_diffs(ox, oy, ax, ay, bx, by):
+    return ax - ox, bx - ax, ay - oy, ay - by
+
+def _cross(*args):
+    p, q, r, s = _cross_diffs(*args)
+    return p * q, r * s
+
+def _dot(*args):
+    p, q, r, s = _dot_diffs(*args)
+    return p * q, r * s
+
+def _orient3d(ax, ay, az, bx, by, bz, cx, cy, cz, dx, dy, dz):
+    ux, uy, uz = bx - ax, by - ay, bz - az
+    vx, vy, vz = cx - ax, cy - ay, cz - az
+    wx, wy, wz = dx - ax, dy - ay, dz - az
+    return ux * vy * wz + uy * vz * wx + uz * vx * wy, ux * vz * wy + uy * vx * wz + uz * vy * wx
+
+def _robust(terms, diffs, args):
+    if all(type(v) is int for v in args):
+        left, right = terms(*args)
+        return left - right
+    if all(type(v) is int or type(v) is float for v in args):
+        left, right = terms(*args)
+        value = left - right
+        if abs(value) >= float_error * (abs(left) + abs(right)):
+            return value
+        return _exact(terms, args)
+
+    arrays = [np.asarray(a) for a in args]
+    if all(a.dtype.kind in "iub" for a in arrays):
+        arrays = [widen(a) for a in arrays]
+        bound = max(_bound(a) for a in arrays)
+        if bound < exact_bound:
+            left, right = terms(*arrays)
+            return left - right
+        if bound >= int64_bound:
+            # Every entry with Python ints
+            left, right = terms(*[a.astype(object) for a in arrays])
+            value = np.asarray(left - right).astype(np.float64)
+            return value if value.ndim else value[()]
+        d = diffs(*arrays)
+        if max(_bound(np.asarray(v)) for v in d) < diff_bound:
+            return d[0] * d[1] - d[2] * d[3]
+    else:
+        d = diffs(*[np.asarray(a, dtype=np.float64) for a in arrays])
+
+    p, q, r, s = [np.asarray(v, dtype=np.float64) for v in d]
+    left, right = p * q, r * s
+    value = np.asarray(left - right)
+    bound = np.abs(left)
+    bound += np.abs(right)
+    bound *= float_error
+    return _settle(terms, value, bound, arrays, 2)
+
+def _settle(terms, value, bound, arrays, degree:int):
+    # Recomputes the entries of value the error bound cannot decide
+    uncertain = np.abs(value) < bound
+    if uncertain.any():
+        value = value.copy()
+        shape = value.shape
+        entries = [np.broadcast_to(a, shape)[uncertain].tolist() for a in arrays]
+        value[uncertain] = [_exact(terms, entry, degree) for entry in zip(*entries)]
+    return value if value.ndim else value[()]
+
+def _exact(terms, args, degree:int=2) -> float:
+    # Floats are m / 2^k, so scaling every coordinate by the largest 2^k
+    # gives integers with the same geometry
+    ratios = [(int(v), 1) if isinstance(v, (int, np.integer)) else float(v).as_integer_ratio() for v in args]
+    scale = max(d for _, d in ratios)
+    left, right = terms(*[n * (scale // d) for n, d in ratios])
+    value = (left - right) / scale ** degree
+    if value == 0 and left != right:
+        return math.copysign(5e-324, left - right)
+    return value
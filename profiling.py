@@ -0,0 +1,124 @@
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+# Optional render instrumentation.
+# A Profiler records wall time, allocated memory blocks and traced bytes per
+# named phase and per Scene.play call, then prints a summary and/or writes a
+# Chrome trace (load it in chrome://tracing or https://ui.perfetto.dev).
+# Scenes opt in through InstrumentedScene and the module level settings
+#   profile       : print a summary once the scene has been constructed
+#   profile_trace : filename to write a Chrome trace to, empty for none
+
+class Profiler:
+    events: list
+    start: float
+    trace_memory: bool
+
+    def __init__(self, trace_memory:bool=True) -> None:
+        self.events = []
+        self.start = time.perf_counter()
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def measure(self, name:str, category:str="phase", **args):
+        blocks = sys.getallocatedblocks()
+        memory = tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.events.append({
+                "name": name,
+                "cat": category,
+                "start": start - self.start,
+                "duration": end - start,
+                "blocks": sys.getallocatedblocks() - blocks,
+                "bytes": (tracemalloc.get_traced_memory()[0] - memory) if self.trace_memory else 0,
+                "args": args,
+            })
+
+    def phase(self, name:str):
+        return self.measure(name, "phase")
+
+    def summary(self) -> list:
+        # Totals per (category, name), slowest first
+        totals = {}
+        for event in self.events:
+            key = (event["cat"], event["name"])
+            total = totals.setdefault(key, {"category": key[0], "name": key[1], "calls": 0, "seconds": 0.0, "blocks": 0, "bytes": 0})
+            total["calls"] += 1
+            total["seconds"] += event["duration"]
+            total["blocks"] += event["blocks"]
+            total["bytes"] += event["bytes"]
+        return sorted(totals.values(), key=lambda t: t["seconds"], reverse=True)
+
+    def report(self) -> str:
+        lines = [f"{'category':<8} {'name':<32} {'calls':>6} {'seconds':>10} {'blocks':>10} {'bytes':>12}"]
+        for t in self.summary():
+            lines.append(f"{t['category']:<8} {t['name']:<32} {t['calls']:>6} {t['seconds']:>10.4f} {t['blocks']:>10} {t['bytes']:>12}")
+        return "\n".join(lines)
+
+    def write_chrome_trace(self, filename:str) -> None:
+        pid = os.getpid()
+        events = [
+            {
+                "name": e["name"],
+                "cat": e["cat"],
+                "ph": "X",
+                "ts": e["start"] * 1e6,
+                "dur": e["duration"] * 1e6,
+                "pid": pid,
+                "tid": 0,
+                "args": {"blocks": e["blocks"], "bytes": e["bytes"], **e["args"]},
+            }
+            for e in self.events
+        ]
+        with open(filename, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def close(self) -> None:
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+class InstrumentedScene:
+    # Mixin for manim Scenes, list it before Scene:
+    #   class GrahamScan(InstrumentedScene, Scene)
+    # Settings are read from the scene's module so they sit next to the
+    # other module level options.
+    profiler: Profiler = None
+
+    def setup(self) -> None:
+        super().setup()
+        module = sys.modules[type(self).__module__]
+        if getattr(module, "profile", False) or getattr(module, "profile_trace", ""):
+            self.profiler = Profiler()
+
+    def tear_down(self) -> None:
+        super().tear_down()
+        if self.profiler is None:
+            return
+        module = sys.modules[type(self).__module__]
+        if getattr(module, "profile", False):
+            print(self.profiler.report())
+        if getattr(module, "profile_trace", ""):
+            self.profiler.write_chrome_trace(module.profile_trace)
+        self.profiler.close()
+
+    def phase(self, name:str):
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.phase(name)
+
+    def play(self, *args, **kwargs):
+        if self.profiler is None:
+            return super().play(*args, **kwargs)
+        names = ", ".join(dict.fromkeys(type(a).__name__ for a in args))
+        with self.profiler.measure(f"play({names})", "play"):
+            return super().play(*args, **kwargs)
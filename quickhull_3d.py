@@ -0,0 +1,96 @@
+import numpy as np
+from manim import BLUE, DEGREES, YELLOW, Create, FadeOut, LaggedStart, ReplacementTransform, ThreeDScene, Write
+
+from geometry import mFace, mPoint3D
+import hull3d
+from profiling import InstrumentedScene
+import rendering
+CompactScene = rendering.CompactScene
+import point_io
+import point_gen
+import scene_settings
+
+points_file = "" # Leave empty for randomized points, otherwise a file of x y z triples
+
+rdn = False
+seed = 3
+num_rand_points = 30
+
+wait = True
+animation_speed = 1
+compact = False # Render each algorithm step as a single play call
+rotate = True # Turn the camera around the finished hull
+
+profile = False # Print time and allocations per algorithm phase and per play call
+profile_trace = "" # Filename for a Chrome trace of the same, empty for none
+
+scene_settings.apply(globals()) # Overrides from render_batch.py, if any
+
+class QuickHull3D(CompactScene, InstrumentedScene, ThreeDScene):
+    def construct(self):
+        with self.phase("load points"):
+            if points_file != "":
+                xs, ys, zs = point_io.load_points_3d(points_file)
+            else:
+                xs, ys, zs = self.randomize_points(0, 10, num_rand_points)
+            axes_range = [
+                (min(c.min().item(), 0) - 1, c.max().item() + 1)
+                for c in (xs, ys, zs)
+            ]
+
+        with self.phase("axes"):
+            axes = rendering.axes(*axes_range)
+            self.set_camera_orientation(phi=65 * DEGREES, theta=-45 * DEGREES)
+        with self.phase("mobjects"):
+            points = [mPoint3D(x, y, z, axes) for x, y, z in zip(xs.tolist(), ys.tolist(), zs.tolist())]
+
+        self.play(Write(axes), run_time=animation_speed)
+        self.play(
+                LaggedStart(
+                    *[Write(p.point) for p in points],
+                    lag_ratio=1 / len(points)
+                    ),
+                run_time=animation_speed
+                )
+
+        quickhull = hull3d.Hull3D(np.column_stack((xs, ys, zs)))
+        faces = {}
+        steps = quickhull.steps()
+        while True:
+            with self.phase("quickhull"):
+                step = next(steps, None)
+            if step is None:
+                break
+            eye, removed, added = step
+            with self.step():
+                if eye >= 0:
+                    # The furthest point above the face being expanded
+                    self.play(ReplacementTransform(points[eye].point, points[eye].set_color(YELLOW).point), run_time=animation_speed)
+                    self.play(*[FadeOut(faces.pop(f).polygon) for f in removed.tolist()], run_time=animation_speed)
+
+                with self.phase("faces"):
+                    for f in added.tolist():
+                        faces[f] = mFace(*[points[i] for i in quickhull.faces[f].tolist()])
+                    vertices = set(quickhull.faces[added].ravel().tolist())
+                self.play(
+                        *[ReplacementTransform(points[i].point, points[i].set_color(BLUE).point) for i in vertices],
+                        LaggedStart(
+                            *[Create(faces[f].polygon) for f in added.tolist()],
+                            lag_ratio=1 / len(added)
+                            ),
+                        run_time=animation_speed
+                        )
+
+        # Everything that is not a hull vertex is inside
+        hull_vertices = set(quickhull.vertices().tolist())
+        inside = [p.point for i, p in enumerate(points) if i not in hull_vertices]
+        if len(inside) > 0:
+            self.play(*[p.animate.set_opacity(0.25) for p in inside], run_time=animation_speed)
+        if rotate:
+            self.begin_ambient_camera_rotation(rate=0.2)
+        if wait: self.wait(3)
+        self.stop_ambient_camera_rotation()
+
+    def randomize_points(self, low:int, high:int, num:int):
+        points = point_gen.grid_points_3d(num, low, high, None if rdn else seed)
+        return points[:, 0], points[:, 1], points[:, 2]
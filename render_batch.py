@@ -0,0 +1,182 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import scene_settings
+
+# Batch rendering of many scenes in parallel.
+# A manifest is a JSON list of jobs:
+#   [
+#     {"algorithm": "graham", "points_file": "points", "options": {"animation_speed": 2}},
+#     {"algorithm": "jarvis", "seed": 7, "name": "jarvis-seed-7"},
+#     {"algorithm": "quickhull_3d", "seed": 1, "quality": "h"}
+#   ]
+# points_file, seed and every entry of options are scene settings (the
+# module level globals of the scene file), injected through
+# scene_settings.py so the files are never edited. Relative points_file
+# paths are taken from the manifest's directory.
+# Each job runs `manim render` in its own temporary media directory and
+# only the finished video is moved into the output directory, as
+# <name>.mp4 next to <name>.json recording the job and its input hash, so
+# names are plain file names (letters, digits, '_', '-' and '.'). The
+# hash covers the job, the points file's contents and the repository's
+# Python sources, and a job whose video exists with the same hash is
+# skipped.
+#
+# Usage:
+#   python render_batch.py manifest.json --output renders --workers 4
+
+SCENES = {
+    "graham": ("graham_scan.py", "GrahamScan"),
+    "jarvis": ("jarvis_march.py", "JarvisMarch"),
+    "quickhull_3d": ("quickhull_3d.py", "QuickHull3D"),
+}
+QUALITIES = ("l", "m", "h", "p", "k")
+JOB_KEYS = ("algorithm", "name", "quality", "points_file", "seed", "options")
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+def read_manifest(filename:str) -> list:
+    with open(filename) as f:
+        jobs = json.load(f)
+    if not isinstance(jobs, list):
+        raise ValueError(f"{filename} must hold a JSON list of jobs")
+    base = os.path.dirname(os.path.abspath(filename))
+    return [_normalize(job, base, i) for i, job in enumerate(jobs)]
+
+def _normalize(job:dict, base:str, i:int) -> dict:
+    if not isinstance(job, dict):
+        raise ValueError(f"Job {i} must be a JSON object")
+    unknown = sorted(set(job) - set(JOB_KEYS))
+    if unknown:
+        raise ValueError(f"Job {i} has unknown keys {', '.join(unknown)}, expected some of {', '.join(JOB_KEYS)}")
+    if job.get("algorithm") not in SCENES:
+        raise ValueError(f"Job {i} algorithm must be one of {', '.join(SCENES)}, got {job.get('algorithm')!r}")
+    quality = job.get("quality", "l")
+    if quality not in QUALITIES:
+        raise ValueError(f"Job {i} quality must be one of {', '.join(QUALITIES)}, got {quality!r}")
+
+    settings = dict(job.get("options", {}))
+    if "seed" in job:
+        settings["seed"] = job["seed"]
+    # Without a points file the scenes draw seeded random points
+    settings["points_file"] = os.path.join(base, job["points_file"]) if job.get("points_file") else ""
+    normalized = {"algorithm": job["algorithm"], "quality": quality, "settings": settings}
+    normalized["hash"] = input_hash(normalized)
+    normalized["name"] = job.get("name") or f"{job['algorithm']}-{normalized['hash'][:12]}"
+    # The name becomes file names in the output directory, so no separators
+    # or leading dots that could point elsewhere
+    if not isinstance(normalized["name"], str) or not re.fullmatch(r"\w[\w.-]*", normalized["name"]):
+        raise ValueError(f"Job {i} name must be letters, digits, '_', '-' or '.', not starting with '.' or '-', got {normalized['name']!r}")
+    return normalized
+
+def input_hash(job:dict) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    # The points file counts by its contents, not by where it is
+    settings = dict(job["settings"], points_file=bool(job["settings"]["points_file"]))
+    digest.update(json.dumps([job["algorithm"], job["quality"], settings], sort_keys=True).encode())
+    if job["settings"]["points_file"]:
+        with open(job["settings"]["points_file"], "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    for source in sorted(glob.glob(os.path.join(here, "*.py"))):
+        digest.update(os.path.basename(source).encode())
+        with open(source, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def is_current(job:dict, output:str) -> bool:
+    video = os.path.join(output, job["name"] + ".mp4")
+    try:
+        with open(os.path.join(output, job["name"] + ".json")) as f:
+            return os.path.exists(video) and json.load(f).get("hash") == job["hash"]
+    except (FileNotFoundError, ValueError):
+        return False
+
+def render(job:dict, output:str) -> str:
+    # Runs in a pool worker, returns the video path
+    filename, scene = SCENES[job["algorithm"]]
+    media = tempfile.mkdtemp(prefix=job["name"] + ".", suffix=".media", dir=output)
+    try:
+        env = dict(os.environ, **{scene_settings.ENV: scene_settings.encode(job["settings"])})
+        command = [sys.executable, "-m", "manim", "render", f"-q{job['quality']}", "--media_dir", media, filename, scene]
+        result = subprocess.run(command, cwd=here, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        if result.returncode != 0:
+            log = os.path.join(output, job["name"] + ".log")
+            with open(log, "wb") as f:
+                f.write(result.stdout)
+            raise RuntimeError(f"manim exited with {result.returncode}, see {log}")
+        videos = [v for v in glob.glob(os.path.join(media, "videos", "**", scene + ".mp4"), recursive=True) if "partial_movie_files" not in v]
+        if len(videos) != 1:
+            raise RuntimeError(f"Expected one {scene}.mp4 in {media}, found {len(videos)}")
+        video = os.path.join(output, job["name"] + ".mp4")
+        os.replace(videos[0], video)
+        with open(os.path.join(output, job["name"] + ".json"), "w") as f:
+            json.dump(job, f, indent=2, sort_keys=True)
+        return video
+    finally:
+        shutil.rmtree(media, ignore_errors=True)
+
+def render_all(jobs:list, output:str, workers:int=None, force:bool=False, log=sys.stderr) -> dict:
+    # Returns {name: "skipped" | "rendered" | error message}
+    output = os.path.abspath(output)
+    os.makedirs(output, exist_ok=True)
+    names = [job["name"] for job in jobs]
+    repeated = sorted({n for n in names if names.count(n) > 1})
+    if repeated:
+        raise ValueError(f"Jobs share the output names {', '.join(repeated)}")
+
+    status = {}
+    todo = []
+    for job in jobs:
+        if not force and is_current(job, output):
+            status[job["name"]] = "skipped"
+            print(f"{job['name']}: up to date", file=log)
+        else:
+            todo.append(job)
+    if not todo:
+        return status
+
+    workers = min(workers or os.cpu_count() or 1, len(todo))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(render, job, output): job["name"] for job in todo}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                future.result()
+                status[name] = "rendered"
+            except Exception as e:
+                status[name] = str(e)
+            print(f"{name}: {status[name]}", file=log)
+    return status
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Render the scenes of a manifest in parallel")
+    parser.add_argument("manifest")
+    parser.add_argument("--output", default="renders", help="directory for the videos, default renders")
+    parser.add_argument("--workers", type=int, default=None, help="parallel renders, default one per core")
+    parser.add_argument("--force", action="store_true", help="render jobs even if their video is up to date")
+    parser.add_argument("--dry-run", action="store_true", help="only list the jobs that would be rendered")
+    args = parser.parse_args(argv)
+
+    jobs = read_manifest(args.manifest)
+    if args.dry_run:
+        for job in jobs:
+            state = "up to date" if not args.force and is_current(job, args.output) else "render"
+            print(f"{job['name']}: {state}")
+        return 0
+    status = render_all(jobs, args.output, args.workers, args.force)
+    failed = [name for name, s in status.items() if s not in ("skipped", "rendered")]
+    print(f"{len(jobs)} jobs, {sum(s == 'rendered' for s in status.values())} rendered, {sum(s == 'skipped' for s in status.values())} skipped, {len(failed)} failed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
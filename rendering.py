@@ -0,0 +1,374 @@
+import contextlib
+import os
+import sys
+import weakref
+import numpy as np
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+from manim import BLUE, GREY_A, GREY_B, RED, WHITE, YELLOW, AnimationGroup, Axes, Create, FadeIn, FadeOut, Group, LaggedStart, Line, PMobject, Rectangle, ReplacementTransform, Succession, Tex, ThreeDAxes, Uncreate, Unwrite, VGroup, Write, config, tempconfig
+from manim.constants import UP
+from manim.utils.family import extract_mobject_family_members
+
+import hull
+import hull_trace
+import hull_cache
+from geometry import mLine
+
+# Scene helpers shared by the GrahamScan and JarvisMarch scenes.
+
+# Labels and axes are built once per distinct text or range from templates
+# kept for the whole process, and copied on use. LaTeX output goes to one
+# tex directory shared by every render (and by render_batch.py's per-job
+# media directories), so a label text is compiled once per machine rather
+# than once per media directory. Empty for manim's own tex_dir. A tex_dir
+# configured for manim itself is left alone, and the shared one is only set
+# while a label is compiled. manim writes the .tex, .dvi and .svg files in
+# place, so labels compile under an exclusive lock on the directory, and
+# without fcntl (Windows) manim's own tex_dir is used. The directory is not
+# counted by HullCache and is never evicted, delete it to reclaim the space.
+tex_cache_dir = os.environ.get("HULL_TEX_CACHE", os.path.join(hull_cache.default_dir, "tex"))
+default_tex_dir = "{media_dir}/Tex" # manim's own default
+_templates = {}
+
+class CompactScene:
+    # Mixin for manim Scenes, list it before Scene (and InstrumentedScene).
+    # With the scene module's `compact` setting on, every play, wait, add and
+    # remove made inside a `with self.step():` block is queued, and a block
+    # with more than one play is rendered as a single play of a _Step. Each
+    # queued play keeps its own run time and is begun (and the adds and
+    # removes queued before it applied) only when the _Step reaches it, so
+    # the frames are the ones the separate plays would draw, but the number
+    # of play calls and partial movie files follows the algorithm steps
+    # instead of the individual animations. A block that raises is dropped.
+    _queue: list = None
+
+    @contextlib.contextmanager
+    def step(self):
+        module = sys.modules[type(self).__module__]
+        if not getattr(module, "compact", False) or self._queue is not None:
+            yield
+            return
+        self._queue = []
+        try:
+            yield
+        except BaseException:
+            self._queue = None
+            raise
+        queue, self._queue = self._queue, None
+        plays = [args for name, args in queue if name == "play"]
+        if len(plays) < 2:
+            for name, args in queue:
+                getattr(self, name)(*args)
+            return
+        ops = [[]]
+        for name, args in queue:
+            if name == "play":
+                ops.append([])
+            else:
+                ops[-1].append((name, args))
+        self.play(_Step(self, plays, ops))
+
+    def play(self, *animations, **kwargs):
+        if self._queue is None:
+            return super().play(*animations, **kwargs)
+        self._queue.append(("play", self.compile_animations(*animations, **kwargs)))
+
+    def add(self, *mobjects):
+        if self._queue is None:
+            return super().add(*mobjects)
+        self._queue.append(("add", mobjects))
+        return self
+
+    def remove(self, *mobjects):
+        if self._queue is None:
+            return super().remove(*mobjects)
+        self._queue.append(("remove", mobjects))
+        return self
+
+    def get_moving_and_static_mobjects(self, animations):
+        if len(animations) != 1 or not isinstance(animations[0], _Step):
+            return super().get_moving_and_static_mobjects(animations)
+        # Only the scene's leading mobjects the step never touches are painted
+        # once, cut at the first one manim itself would redraw every frame
+        # (updaters, foreground mobjects, a moving 3D camera).
+        step = animations[0]
+        static = self.mobjects[:step.static]
+        moving = self.get_moving_mobjects(step)
+        for i, mob in enumerate(static):
+            if moving and moving[0] in mob.get_family():
+                static = static[:i]
+                break
+        return [step.mobject], extract_mobject_family_members(static, use_z_index=self.renderer.camera.use_z_index, only_those_with_points=True)
+
+class _Step(Succession):
+    # The queued plays of one CompactScene.step() block, see above. `ops[k]`
+    # holds the adds and removes queued before play k (the last entry the
+    # ones after the last play). The mobject is an empty Group that holds
+    # the scene's mobjects past the `static` leading ones while the step
+    # plays, refilled whenever a play begins. The scene is only weakly
+    # referenced, which also keeps it out of manim's play hash.
+    def __init__(self, scene, plays, ops):
+        super().__init__(*[AnimationGroup(*animations) for animations in plays], group=Group())
+        self.ops = ops
+        self.scene = weakref.ref(scene)
+        touched = [mob for animation in _leaves(self.animations) for mob in animation.get_all_mobjects()]
+        touched += [mob for before in ops for name, mobjects in before for mob in mobjects]
+        touched = {id(member) for mob in touched for member in mob.get_family()}
+        self.static = 0
+        for mob in scene.mobjects:
+            if any(id(member) in touched for member in mob.get_family()):
+                break
+            self.static += 1
+
+    def update_active_animation(self, index):
+        scene = self.scene()
+        scene.mobjects = [mob for mob in scene.mobjects if mob is not self.mobject]
+        if index > 0:
+            self.animations[index - 1].clean_up_from_scene(scene)
+        for name, mobjects in self.ops[index]:
+            getattr(scene, name)(*mobjects)
+        if index < len(self.animations):
+            scene.add_mobjects_from_animations(self.animations[index].animations)
+        self.mobject.submobjects = [*scene.mobjects[self.static:], *scene.foreground_mobjects]
+        scene.moving_mobjects = [self.mobject]
+        super().update_active_animation(index)
+
+    def clean_up_from_scene(self, scene):
+        # The plays were cleaned up as the step moved past them.
+        scene.mobjects = [mob for mob in scene.mobjects if mob is not self.mobject]
+
+def _leaves(animations):
+    for animation in animations:
+        if isinstance(animation, AnimationGroup):
+            yield from _leaves(animation.animations)
+        else:
+            yield animation
+
+class LevelOfDetailScene:
+    # Mixin for manim Scenes, list it before Scene.
+    # Above the scene module's `lod_threshold` number of points, every point
+    # that is not given its own Dot is drawn in one point cloud mobject,
+    # fan-outs only draw `lod_rays` evenly spaced rays (plus the ones that
+    # matter), and points dropped by the algorithm fade back into the cloud
+    # instead of staying on screen as red Dots.
+    lod: bool = False
+    cloud: PMobject = None
+    individual: np.ndarray = None
+
+    def introduce_points(self, point_set, axes, individual=None):
+        # Points in `individual` (by default the hull vertices) keep their
+        # own Dot
+        module = sys.modules[type(self).__module__]
+        threshold = getattr(module, "lod_threshold", 0)
+        self.lod = 0 < threshold < len(point_set)
+        if not self.lod:
+            return LaggedStart(
+                    *[Write(p.point) for p in point_set.mpoints()],
+                    lag_ratio=1 / len(point_set)
+                    )
+
+        if individual is None:
+            individual = hull.convex_hull(point_set)
+        self.individual = np.zeros(len(point_set), dtype=bool)
+        self.individual[np.asarray(individual, dtype=np.int64)] = True
+        self.cloud = point_cloud(axes, point_set.xs[~self.individual], point_set.ys[~self.individual])
+        dots = [point_set.mpoint(i).point for i in np.flatnonzero(self.individual)]
+        return AnimationGroup(
+                FadeIn(self.cloud),
+                LaggedStart(*[Write(d) for d in dots], lag_ratio=1 / max(len(dots), 1))
+                )
+
+    def shrink_cloud(self, point_set, axes, keep):
+        # Replace the cloud by one holding only the kept points
+        kept = np.zeros(len(point_set), dtype=bool)
+        kept[keep] = True
+        cloud = point_cloud(axes, point_set.xs[kept & ~self.individual], point_set.ys[kept & ~self.individual])
+        old, self.cloud = self.cloud, cloud
+        return AnimationGroup(FadeOut(old), FadeIn(cloud))
+
+    def visible_lines(self, lines, keep=()):
+        module = sys.modules[type(self).__module__]
+        limit = getattr(module, "lod_rays", 0)
+        if not self.lod or limit <= 0 or len(lines) <= limit:
+            return lines
+        sampled = set(np.linspace(0, len(lines) - 1, limit).round().astype(int).tolist())
+        keep = [id(l) for l in keep]
+        return [l for i, l in enumerate(lines) if i in sampled or id(l) in keep]
+
+    def retire_point(self, mpoint, color=RED):
+        if self.lod:
+            return FadeOut(mpoint.point)
+        return ReplacementTransform(mpoint.point, mpoint.point.set_color(color))
+
+class ReplayScene:
+    # Mixin for manim Scenes, list it before Scene (after CompactScene and
+    # LevelOfDetailScene, whose helpers it uses).
+    # With the scene module's `replay` setting naming an algorithm, the hull
+    # is computed by a headless pass (hull_trace.py) and the scene only
+    # renders the recorded events. `trace_file` keeps the trace between
+    # renders: it is read when it exists and written after recording
+    # otherwise, so re-rendering never runs the algorithm again. Without a
+    # trace_file, the module's `cache` setting keeps traces and hulls in the
+    # shared on-disk cache (hull_cache.py) instead.
+
+    def algorithm_trace(self, point_set, algorithm:str):
+        module = sys.modules[type(self).__module__]
+        filename = getattr(module, "trace_file", "")
+        if filename != "" and os.path.exists(filename):
+            trace = hull_trace.Trace.read(filename)
+            if trace.algorithm != algorithm or trace.n != len(point_set):
+                raise ValueError(f"{filename} traces {trace.algorithm} over {trace.n} points, expected {algorithm} over {len(point_set)}")
+            return trace
+        cull = getattr(module, "cull", False)
+        if filename == "" and getattr(module, "cache", False):
+            return hull_cache.HullCache().trace(point_set, algorithm, cull)
+        trace = hull_trace.record(point_set, algorithm, cull)
+        if filename != "":
+            trace.write(filename)
+        return trace
+
+    def hull_indices(self, point_set, engine:str):
+        module = sys.modules[type(self).__module__]
+        cull = getattr(module, "cull", False)
+        if getattr(module, "cache", False):
+            return hull_cache.HullCache().hull(point_set, engine, cull)
+        return hull.convex_hull(point_set, engine, cull)
+
+    def play_degenerate(self, point_set, axes) -> None:
+        # Inputs where hull.is_degenerate holds have a known hull of one or
+        # two points, drawn without running any algorithm
+        trace = hull_trace.Trace("degenerate", len(point_set))
+        for i in hull.convex_hull(point_set).tolist():
+            trace.push(i)
+        self.play_trace(trace, point_set, axes)
+
+    def play_trace(self, trace, point_set, axes) -> None:
+        module = sys.modules[type(self).__module__]
+        run_time = getattr(module, "animation_speed", 1)
+        chain, edges, sweep = [], [], None
+
+        # Every push ends one algorithm step
+        steps, current = [], []
+        for event in trace:
+            current.append(event)
+            if event[0] == hull_trace.PUSH:
+                steps.append(current)
+                current = []
+        steps.append(current)
+
+        for events in steps:
+            with self.step():
+                for event in events:
+                    kind = event[0]
+                    if kind == hull_trace.TEST:
+                        line = mLine(point_set.mpoint(event[1]), point_set.mpoint(event[2])).set_color(YELLOW)
+                        self.play(Succession(Create(line.line), Uncreate(line.line)), run_time=run_time)
+                    elif kind == hull_trace.SWEEP:
+                        bottom = axes.c2p(event[1], axes.y_range[0])
+                        if sweep is None:
+                            sweep = Line(bottom, axes.c2p(event[1], axes.y_range[1]), color=GREY_B)
+                            self.play(Create(sweep), run_time=run_time)
+                        else:
+                            self.play(sweep.animate.set_x(bottom[0]), run_time=run_time)
+                    elif kind == hull_trace.PUSH:
+                        point = point_set.mpoint(event[1])
+                        animations = [ReplacementTransform(point.point, point.point.set_color(BLUE))]
+                        if len(chain) > 0:
+                            edges.append(mLine(point_set.mpoint(chain[-1]), point))
+                            animations.append(Write(edges[-1].line))
+                        chain.append(event[1])
+                        self.play(*animations, run_time=run_time)
+                    elif kind == hull_trace.POP:
+                        chain.pop()
+                        animations = [self.retire_point(point_set.mpoint(event[1]))]
+                        if len(edges) > 0:
+                            animations.append(Unwrite(edges.pop().line))
+                        self.play(*animations, run_time=run_time)
+
+        if sweep is not None:
+            self.play(FadeOut(sweep), run_time=run_time)
+        if len(chain) > 2:
+            edges.append(mLine(point_set.mpoint(chain[-1]), point_set.mpoint(chain[0])))
+            self.play(Write(edges[-1].line), run_time=run_time)
+        if len(edges) > 0:
+            self.play(
+                LaggedStart(
+                    *[ReplacementTransform(e.line, e.set_color(BLUE).line) for e in edges],
+                    lag_ratio=1 / len(edges)
+                ),
+                run_time=run_time
+            )
+
+def axes_points(axes, xs, ys) -> np.ndarray:
+    # Vectorized axes.c2p for linear axes
+    x0, y0 = float(axes.x_range[0]), float(axes.y_range[0])
+    origin = np.array(axes.c2p(x0, y0))
+    dx = np.array(axes.c2p(x0 + 1, y0)) - origin
+    dy = np.array(axes.c2p(x0, y0 + 1)) - origin
+    xs = np.asarray(xs, dtype=np.float64) - x0
+    ys = np.asarray(ys, dtype=np.float64) - y0
+    return origin + xs[:, None] * dx + ys[:, None] * dy
+
+def point_cloud(axes, xs, ys, color=RED, size:float=4) -> PMobject:
+    cloud = PMobject(stroke_width=size)
+    if len(xs) > 0:
+        cloud.add_points(axes_points(axes, xs, ys), color=color)
+    return cloud
+
+def label(text:str, anchor) -> VGroup:
+    # Tex in a translucent box, placed above anchor
+    template = _templates.get(("label", text))
+    if template is None:
+        if tex_cache_dir != "" and config.tex_dir == default_tex_dir and fcntl is not None:
+            os.makedirs(tex_cache_dir, exist_ok=True)
+            with open(os.path.join(tex_cache_dir, ".lock"), "wb") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                with tempconfig({"tex_dir": tex_cache_dir}):
+                    tex = Tex(text, color=WHITE)
+        else:
+            tex = Tex(text, color=WHITE)
+        box = Rectangle(
+                width=tex.width + 0.25,
+                height=tex.height + 0.25,
+                color=WHITE,
+                fill_color=WHITE,
+                fill_opacity=0.1
+                )
+        box.move_to(tex)
+        template = _templates[("label", text)] = VGroup(tex, box)
+    group = template.copy()
+    group[0].next_to(anchor, UP)
+    group[1].move_to(group[0])
+    return group
+
+def axes(x_range, y_range, z_range=None) -> Axes:
+    # The scenes' axes, ThreeDAxes when z_range is given
+    key = ("axes", tuple(x_range), tuple(y_range), None if z_range is None else tuple(z_range))
+    template = _templates.get(key)
+    if template is None:
+        axis_config = {
+            "stroke_color": GREY_A,
+            "stroke_width": 2,
+            }
+        if z_range is None:
+            template = Axes(
+                    x_range=x_range,
+                    y_range=y_range,
+                    x_length=10,
+                    y_length=6,
+                    axis_config=axis_config,
+                    )
+        else:
+            template = ThreeDAxes(
+                    x_range=x_range,
+                    y_range=y_range,
+                    z_range=z_range,
+                    x_length=6,
+                    y_length=6,
+                    z_length=5,
+                    axis_config=axis_config,
+                    )
+        _templates[key] = template
+    return template.copy()
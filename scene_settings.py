@@ -0,0 +1,33 @@
+import json
+import os
+
+# Settings injected into the scene modules from outside.
+# Every scene module keeps its settings as module level globals and calls
+# apply(globals()) right after them. When the HULL_SCENE_SETTINGS
+# environment variable holds a JSON object, its entries replace those
+# globals for this process only, so render_batch.py can render the same
+# scene with different points, seeds or speeds without editing the file.
+# Names that are not settings of the module are rejected rather than
+# silently ignored.
+
+ENV = "HULL_SCENE_SETTINGS"
+
+def encode(settings:dict) -> str:
+    return json.dumps(settings, sort_keys=True)
+
+def apply(namespace:dict, environ=os.environ) -> dict:
+    # Returns the settings that were applied
+    raw = environ.get(ENV, "")
+    if raw == "":
+        return {}
+    settings = json.loads(raw)
+    if not isinstance(settings, dict):
+        raise ValueError(f"{ENV} must hold a JSON object, got {type(settings).__name__}")
+    # Settings are the lower case globals of plain types, which leaves out
+    # the manim names and constants the module imports
+    known = {k for k, v in namespace.items() if k.islower() and not k.startswith("_") and isinstance(v, (bool, int, float, str))}
+    unknown = sorted(set(settings) - known)
+    if unknown:
+        raise ValueError(f"Unknown scene settings {', '.join(unknown)}, expected some of {', '.join(sorted(known))}")
+    namespace.update(settings)
+    return settings
@@ -0,0 +1,109 @@
+from fractions import Fraction
+import numpy as np
+import pytest
+
+import batch
+import hull
+import hull3d
+import hull_trace
+from incremental import IncrementalHull
+
+# Every 2D engine against a brute-force hull computed with exact Python
+# numbers, on random integers, nearly collinear floats and coordinates
+# around +-2^61 where int64 products would overflow. Hulls are compared as
+# coordinates, repeated points may come back under any of their indices.
+
+def _exact(value):
+    return Fraction(value) if isinstance(value, float) else value
+
+def brute_force_hull(points) -> list:
+    # A directed edge a -> b is on the clockwise hull when every other point
+    # is strictly to its right or on the segment between a and b
+    pts = sorted({(_exact(x), _exact(y)) for x, y in points.tolist()})
+    if len(pts) == 1:
+        return pts
+    edges = {}
+    for a in pts:
+        for b in pts:
+            if a == b:
+                continue
+            for c in pts:
+                cross = (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+                if cross > 0:
+                    break
+                if cross == 0 and c not in (a, b) and not (min(a, b) < c < max(a, b)):
+                    break
+            else:
+                edges[a] = b
+    start = min(pts, key=lambda p: (p[0], -p[1]))
+    chain = [start]
+    while edges[chain[-1]] != start:
+        chain.append(edges[chain[-1]])
+    return chain
+
+def _coords(points, indices) -> list:
+    return [(_exact(x), _exact(y)) for x, y in points[np.asarray(indices, dtype=np.int64)].tolist()]
+
+def random_ints(rng, n:int):
+    return rng.integers(-50, 50, size=(n, 2))
+
+def near_collinear(rng, n:int):
+    # y = x / 3 rounded, then nudged by a few ulps either way
+    xs = rng.uniform(-1e3, 1e3, n)
+    ys = xs / 3
+    return np.column_stack((xs, ys + rng.integers(-2, 3, n) * np.spacing(ys)))
+
+def huge_ints(rng, n:int):
+    points = rng.integers(-2 ** 61, 2 ** 61, size=(n, 2), dtype=np.int64)
+    points[:4] = [[-2 ** 61, -2 ** 61], [2 ** 61, -2 ** 61], [2 ** 61, 2 ** 61], [-2 ** 61, 2 ** 61]]
+    return points
+
+INPUTS = [random_ints, near_collinear, huge_ints]
+
+@pytest.fixture(params=[(make, seed) for make in INPUTS for seed in range(3)], ids=lambda p: f"{p[0].__name__}-{p[1]}")
+def points(request):
+    make, seed = request.param
+    return make(np.random.default_rng(seed), 40)
+
+@pytest.mark.parametrize("engine", sorted(hull.ENGINES))
+def test_engines(points, engine):
+    assert _coords(points, hull.convex_hull(points, engine)) == brute_force_hull(points)
+    assert _coords(points, hull.convex_hull(points, engine, cull=True)) == brute_force_hull(points)
+
+@pytest.mark.parametrize("algorithm", sorted(hull_trace.TRACERS))
+def test_tracers(points, algorithm):
+    assert _coords(points, hull_trace.record(points, algorithm).hull()) == brute_force_hull(points)
+
+def test_batch_hull(points):
+    sets = [points[:1], points[:2], points[:7], points[7:], points]
+    indices, offsets = batch.batch_hull(np.concatenate(sets), np.cumsum([0] + [len(s) for s in sets]))
+    for i, s in enumerate(sets):
+        assert _coords(s, indices[offsets[i]:offsets[i + 1]]) == brute_force_hull(s)
+
+def test_incremental_hull(points):
+    one_by_one = IncrementalHull()
+    for point in points:
+        one_by_one.add(point)
+    assert _coords(one_by_one.vertices(), np.arange(len(one_by_one))) == brute_force_hull(points)
+    merged = IncrementalHull(points[:5])
+    merged.add_many(points[5:])
+    assert _coords(merged.vertices(), np.arange(len(merged))) == brute_force_hull(points)
+
+@pytest.mark.parametrize("scale", [50, 2 ** 61])
+def test_hull3d_is_closed(scale):
+    points = np.random.default_rng(scale % 7).integers(-scale, scale, size=(200, 3), dtype=np.int64)
+    result = hull3d.Hull3D(points).run()
+    faces, neighbors = result.hull_faces(), result.hull_neighbors()
+    # Every directed edge once, its reverse once from the neighbouring face
+    edges = {}
+    for f, (a, b, c) in enumerate(faces.tolist()):
+        for edge in ((a, b), (b, c), (c, a)):
+            assert edge not in edges
+            edges[edge] = f
+    for (a, b), f in edges.items():
+        assert edges[(b, a)] in neighbors[f]
+    assert len(result.vertices()) - len(edges) // 2 + len(faces) == 2
+    # No point above any face
+    ids = np.arange(len(points))
+    for f in np.flatnonzero(result.alive[:result.count]):
+        assert np.all(result.above(f, ids) <= 0)